@@ -23,18 +23,19 @@ from tw.models import Annotation, AnnotationType, Issue, IssueStatus, IssueType
 console = Console(stderr=True)
 logger = logging.getLogger(__name__)
 
+# "[type] message" annotation descriptions, and the tw types they may name
+_ANNOTATION_TAG_RE = re.compile(r"^\[([a-z-]+)\]\s*(.*)$", re.DOTALL)
+_ANNOTATION_TYPES = {t.value: t for t in AnnotationType}
+
 
 def parse_annotation(entry: str, description: str) -> Annotation:
     """Parse TaskWarrior annotation into Annotation object."""
     timestamp = datetime.strptime(entry, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
 
-    match = re.match(r"^\[([a-z-]+)\]\s*(.*)$", description, re.DOTALL)
+    match = _ANNOTATION_TAG_RE.match(description)
     if match:
         type_str, message = match.groups()
-        try:
-            ann_type = AnnotationType(type_str)
-        except ValueError:
-            ann_type = AnnotationType.COMMENT
+        ann_type = _ANNOTATION_TYPES.get(type_str, AnnotationType.COMMENT)
     else:
         ann_type = AnnotationType.COMMENT
         message = description
@@ -6,6 +6,7 @@ import uuid as uuid_module
 from datetime import UTC, datetime
 from pathlib import Path
 
+from tw.config import SQLITE_SYNCHRONOUS_MODES
 from tw.models import Annotation, AnnotationType, Issue, IssueStatus, IssueType
 
 logger = logging.getLogger(__name__)
@@ -14,28 +15,41 @@ logger = logging.getLogger(__name__)
 class SqliteBackend:
     """SQLite backend for tw issue tracker."""
 
-    def __init__(self, db_path: Path | str) -> None:
+    def __init__(self, db_path: Path | str, synchronous: str | None = None) -> None:
         """Initialize SQLite backend.
 
         Args:
             db_path: Path to the SQLite database file.
+            synchronous: Optional PRAGMA synchronous mode (OFF, NORMAL, FULL,
+                EXTRA) applied to every connection; None keeps SQLite's default.
 
         Raises:
+            ValueError: If synchronous is not a recognized mode.
             sqlite3.DatabaseError: If database initialization fails.
         """
+        if synchronous is not None and synchronous.upper() not in SQLITE_SYNCHRONOUS_MODES:
+            raise ValueError(f"Invalid synchronous mode: {synchronous!r}")
         self._db_path = Path(db_path)
+        self._synchronous = synchronous
         from tw.schema import init_db
 
         init_db(self._db_path)
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the pragmas every operation relies on."""
+        conn = sqlite3.connect(self._db_path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        if self._synchronous is not None:
+            conn.execute(f"PRAGMA synchronous = {self._synchronous}")
+        return conn
+
     def get_all_issues(self) -> list[Issue]:
         """Get all issues.
 
         Returns:
             List of all issues.
         """
-        with sqlite3.connect(self._db_path) as conn:
-            conn.execute("PRAGMA foreign_keys = ON")
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(
@@ -44,10 +58,36 @@ class SqliteBackend:
             )
             rows = cursor.fetchall()
 
+            # Load annotations and refs for every issue up front rather than
+            # issuing two queries per issue.
+            annotations_by_issue: dict[int, list[Annotation]] = {}
+            cursor.execute("SELECT issue_id, type, timestamp, message FROM annotations ORDER BY id")
+            for ann_row in cursor.fetchall():
+                timestamp = datetime.strptime(ann_row["timestamp"], "%Y%m%dT%H%M%SZ").replace(
+                    tzinfo=UTC
+                )
+                annotations_by_issue.setdefault(ann_row["issue_id"], []).append(
+                    Annotation(
+                        type=AnnotationType(ann_row["type"]),
+                        timestamp=timestamp,
+                        message=ann_row["message"],
+                    )
+                )
+
+            refs_by_issue: dict[int, list[str]] = {}
+            cursor.execute(
+                "SELECT source_issue_id, target_tw_id FROM issue_refs "
+                "WHERE target_tw_id IS NOT NULL ORDER BY id"
+            )
+            for ref_row in cursor.fetchall():
+                refs_by_issue.setdefault(ref_row["source_issue_id"], []).append(
+                    ref_row["target_tw_id"]
+                )
+
             issues = []
             for row in rows:
-                annotations = self._get_annotations_for_issue_id(conn, row["id"])
-                tw_refs = self._get_refs_for_issue_id(conn, row["id"])
+                annotations = annotations_by_issue.get(row["id"], [])
+                tw_refs = refs_by_issue.get(row["id"], [])
                 created_at = datetime.strptime(row["created_at"], "%Y%m%dT%H%M%SZ").replace(
                     tzinfo=UTC
                 )
@@ -79,8 +119,7 @@ class SqliteBackend:
         Returns:
             The Issue object or None if not found.
         """
-        with sqlite3.connect(self._db_path) as conn:
-            conn.execute("PRAGMA foreign_keys = ON")
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(
@@ -126,8 +165,7 @@ class SqliteBackend:
             RuntimeError: If the save operation fails.
         """
         try:
-            with sqlite3.connect(self._db_path) as conn:
-                conn.execute("PRAGMA foreign_keys = ON")
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -203,6 +241,73 @@ class SqliteBackend:
             logger.error(f"Failed to save issue {issue.id}: {e}")
             raise RuntimeError(f"Failed to save issue {issue.id}") from e
 
+    def insert_issues(self, issues: list[Issue]) -> None:
+        """Insert new issues in a single transaction.
+
+        Rows, annotations and refs are written with one executemany each, so
+        a batch of N issues costs one commit rather than N. Refs are only
+        recorded when the target issue exists, including targets inserted
+        earlier in the same batch.
+
+        Args:
+            issues: The new issues to insert
+
+        Raises:
+            RuntimeError: If the insert fails; no issues are written.
+        """
+        if not issues:
+            return
+
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+
+                cursor.executemany(
+                    "INSERT INTO issues (uuid, tw_id, tw_type, title, tw_status, "
+                    "tw_parent, tw_body, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            str(uuid_module.uuid4()),
+                            issue.id,
+                            issue.type.value,
+                            issue.title,
+                            issue.status.value,
+                            issue.parent,
+                            issue.body,
+                            issue.created_at.strftime("%Y%m%dT%H%M%SZ"),
+                            issue.updated_at.strftime("%Y%m%dT%H%M%SZ"),
+                        )
+                        for issue in issues
+                    ],
+                )
+                cursor.executemany(
+                    "INSERT INTO annotations (issue_id, type, timestamp, message) "
+                    "SELECT id, ?, ?, ? FROM issues WHERE tw_id = ?",
+                    [
+                        (
+                            annotation.type.value,
+                            annotation.timestamp.strftime("%Y%m%dT%H%M%SZ"),
+                            annotation.message,
+                            issue.id,
+                        )
+                        for issue in issues
+                        for annotation in issue.annotations or []
+                    ],
+                )
+                cursor.executemany(
+                    "INSERT INTO issue_refs (source_issue_id, target_tw_id) "
+                    "SELECT s.id, t.tw_id FROM issues s "
+                    "JOIN issues t ON t.tw_id = ? WHERE s.tw_id = ?",
+                    [(ref, issue.id) for issue in issues for ref in issue.refs or []],
+                )
+
+                conn.commit()
+        except sqlite3.DatabaseError as e:
+            ids = ", ".join(issue.id for issue in issues)
+            logger.error(f"Failed to insert issues {ids}: {e}")
+            raise RuntimeError(f"Failed to insert issues {ids}") from e
+
     def delete_issue(self, tw_id: str) -> None:
         """Delete an issue.
 
@@ -214,8 +319,7 @@ class SqliteBackend:
             RuntimeError: If the delete operation fails.
         """
         try:
-            with sqlite3.connect(self._db_path) as conn:
-                conn.execute("PRAGMA foreign_keys = ON")
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -249,8 +353,7 @@ class SqliteBackend:
         Raises:
             KeyError: If the issue is not found.
         """
-        with sqlite3.connect(self._db_path) as conn:
-            conn.execute("PRAGMA foreign_keys = ON")
+        with self._connect() as conn:
             cursor = conn.cursor()
 
             cursor.execute(
@@ -280,8 +383,7 @@ class SqliteBackend:
         Returns:
             List of all issue IDs.
         """
-        with sqlite3.connect(self._db_path) as conn:
-            conn.execute("PRAGMA foreign_keys = ON")
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT tw_id FROM issues")
             rows = cursor.fetchall()
@@ -351,8 +453,7 @@ class SqliteBackend:
         Returns:
             List of issue IDs that reference this issue.
         """
-        with sqlite3.connect(self._db_path) as conn:
-            conn.execute("PRAGMA foreign_keys = ON")
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT i.tw_id FROM issue_refs r "
@@ -3,23 +3,24 @@
 import json
 import logging
 import os
+import re
+import shlex
 import subprocess
 import sys
 import tempfile
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass
 from typing import Any
 
 import click
-import questionary
-from questionary import Style
 from rich.console import Console
 from rich.logging import RichHandler
 
-from tw import watch as watch_module
 from tw.backend import SqliteBackend
-from tw.config import ConfigError, get_db_path, get_prefix
+from tw.config import ConfigError, get_db_path, get_prefix, get_sqlite_synchronous
 from tw.models import AnnotationType, Issue, IssueStatus, IssueType
 from tw.render import (
+    ENTRY_START_RE,
     build_claude_prompt,
     generate_edit_template,
     parse_edited_content,
@@ -31,18 +32,63 @@ from tw.render import (
     render_tree_with_backlog,
     render_view,
 )
-from tw.service import IssueService
-from tw.tui import run_tui
+from tw.service import IssueDraft, IssueService
 
 logger = logging.getLogger(__name__)
 
-PROMPT_STYLE = Style([
+# A full capture DSL "- type: title" entry; ENTRY_START_RE matches just its start
+_ENTRY_RE = re.compile(r"^(\s*)-\s*(epic|story|task|bug|idea):\s*(.+)$")
+
+# Parameters that read stdin when given "-", by command name; batch rejects
+# these because its own stdin is the script being run
+_STDIN_PARAMS = {"new": "body", "edit": "body", "capture": "input_source"}
+
+# Fixed argv for launching claude; the model flag and prompt are appended
+_CLAUDE_ARGV = ("claude", "--dangerously-skip-permissions")
+_MODEL_ARGS: dict[str, tuple[str, ...]] = {
+    "opus": ("--model", "opus"),
+    "sonnet": ("--model", "sonnet"),
+    "haiku": ("--model", "haiku"),
+}
+
+# questionary prompt styling. questionary (and prompt_toolkit behind it), the
+# TUI, and the file watcher are imported inside the commands that use them so
+# that every other command starts without loading them.
+_PROMPT_STYLE_RULES = [
     ("highlighted", "fg:white bg:blue bold"),
     ("pointer", "fg:cyan bold"),
     ("completion-menu", "bg:#333333 fg:#ffffff"),
     ("completion-menu.completion", "bg:#333333 fg:#ffffff"),
     ("completion-menu.completion.current", "bg:#0066cc fg:#ffffff bold"),
-])
+]
+
+
+def _echo_json(data: Any, indent: int | None = None) -> None:
+    """Write --json output directly to stdout, bypassing Rich markup and highlighting."""
+    click.echo(json.dumps(data, indent=indent))
+
+
+def _issue_to_dict(issue: Issue) -> dict[str, Any]:
+    """Convert an issue to the dict used for --json output."""
+    return {
+        "tw_id": issue.id,
+        "tw_type": issue.type.value,
+        "title": issue.title,
+        "tw_status": issue.status.value,
+        "tw_parent": issue.parent,
+        "tw_body": issue.body,
+        "tw_refs": issue.refs,
+        "created_at": issue.created_at.isoformat(),
+        "updated_at": issue.updated_at.isoformat(),
+        "annotations": [
+            {
+                "type": ann.type.value,
+                "timestamp": ann.timestamp.isoformat(),
+                "message": ann.message,
+            }
+            for ann in (issue.annotations or [])
+        ],
+    }
 
 
 def get_service(ctx: click.Context) -> IssueService:
@@ -55,10 +101,11 @@ def get_service(ctx: click.Context) -> IssueService:
         try:
             ctx.obj["db_path"] = get_db_path()
             ctx.obj["prefix"] = get_prefix()
+            ctx.obj["synchronous"] = get_sqlite_synchronous()
         except ConfigError as e:
             raise click.ClickException(str(e))
 
-    backend = SqliteBackend(ctx.obj["db_path"])
+    backend = SqliteBackend(ctx.obj["db_path"], synchronous=ctx.obj.get("synchronous"))
     return IssueService(
         backend=backend,
         prefix=ctx.obj["prefix"],
@@ -66,7 +113,7 @@ def get_service(ctx: click.Context) -> IssueService:
 
 
 
-@dataclass
+@dataclass(slots=True)
 class CaptureEntry:
     """Parsed entry from capture DSL."""
 
@@ -76,111 +123,166 @@ class CaptureEntry:
     body: str | None = None
 
 
-def parse_capture_dsl(content: str) -> list[CaptureEntry]:
-    """Parse the indented DSL and return entries.
+def _find_parent_title(parent_stack: dict[int, str], indent: int) -> str | None:
+    """Return the title of the closest entry at a lower indent, if any."""
+    for check_indent in range(indent - 1, -1, -1):
+        if check_indent in parent_stack:
+            return parent_stack[check_indent]
+    return None
 
-    Supports multi-line body content indented below the type: title line.
-    Body uses --- separator for repeatable/non-repeatable sections.
+
+def _collect_body(lines: Iterator[str], indent: int) -> tuple[str | None, str | None]:
+    """Collect body lines belonging to the entry whose "-" line is at indent.
 
     Args:
-        content: DSL content with format "- type: title"
+        lines: Remaining DSL lines, starting after the entry line
+        indent: Indent of the entry's "-" line
 
     Returns:
-        List of CaptureEntry tuples with (type, title, parent_title, body)
+        Tuple of (body or None, first line not consumed or None at end of input)
     """
-    import re
+    body_lines: list[str] = []
+    body_indent = None  # Will be determined from first body line
+    body_line = next(lines, None)
+
+    while body_line is not None:
+        # Empty line - include in body if we have content
+        if not body_line.strip():
+            if body_lines:
+                body_lines.append("")
+            body_line = next(lines, None)
+            continue
 
-    entries: list[CaptureEntry] = []
-    parent_stack: dict[int, str] = {}
+        # Comment line in body - skip
+        if body_line.strip().startswith("# tw:"):
+            body_line = next(lines, None)
+            continue
+
+        # Check if this is a new entry (starts with -)
+        if ENTRY_START_RE.match(body_line):
+            break
 
-    lines = content.splitlines()
-    i = 0
+        # Check indentation - must be more indented than entry line
+        line_indent = len(body_line) - len(body_line.lstrip())
+        if line_indent <= indent:
+            break
+
+        # Determine body indentation from first body line
+        if body_indent is None:
+            body_indent = line_indent
+
+        # Strip the body indentation
+        if line_indent >= body_indent:
+            stripped = body_line[body_indent:]
+        else:
+            stripped = body_line.strip()
+        body_lines.append(stripped)
+        body_line = next(lines, None)
+
+    # Clean up trailing empty lines
+    while body_lines and not body_lines[-1]:
+        body_lines.pop()
+
+    body = "\n".join(body_lines) if body_lines else None
+    return body, body_line
+
+
+def iter_capture_dsl(lines: Iterable[str]) -> Iterator[CaptureEntry]:
+    """Parse the indented DSL line by line, yielding entries as they complete.
+
+    Lines may carry trailing newlines, so an open file or text stream can be
+    passed directly without reading it into memory first.
+
+    Args:
+        lines: DSL lines with format "- type: title"
+
+    Yields:
+        CaptureEntry for each entry, in input order
+    """
+    parent_stack: dict[int, str] = {}
 
-    while i < len(lines):
-        line = lines[i]
+    remaining = (raw.rstrip("\r\n") for raw in lines)
+    line = next(remaining, None)
 
+    while line is not None:
         # Skip empty lines and comments
         if not line.strip() or line.strip().startswith("#"):
-            i += 1
+            line = next(remaining, None)
             continue
 
         # Check for entry start: "- type: title"
-        match = re.match(r'^(\s*)-\s*(epic|story|task|bug|idea):\s*(.+)$', line)
+        match = _ENTRY_RE.match(line)
         if not match:
-            i += 1
+            line = next(remaining, None)
             continue
 
         indent_str, issue_type, title = match.groups()
         indent = len(indent_str)
 
         # Determine parent from indent
-        parent_title = None
-        if indent > 0:
-            # Find closest parent at lower indent
-            for check_indent in range(indent - 1, -1, -1):
-                if check_indent in parent_stack:
-                    parent_title = parent_stack[check_indent]
-                    break
+        parent_title = _find_parent_title(parent_stack, indent) if indent > 0 else None
 
         # Collect body lines (more indented than the - line)
-        body_lines: list[str] = []
-        body_indent = None  # Will be determined from first body line
-        i += 1
-
-        while i < len(lines):
-            body_line = lines[i]
-
-            # Empty line - include in body if we have content
-            if not body_line.strip():
-                if body_lines:
-                    body_lines.append("")
-                i += 1
-                continue
-
-            # Comment line in body - skip
-            if body_line.strip().startswith("# tw:"):
-                i += 1
-                continue
-
-            # Check if this is a new entry (starts with -)
-            if re.match(r'^\s*-\s*(epic|story|task|bug|idea):', body_line):
-                break
-
-            # Check indentation - must be more indented than entry line
-            line_indent = len(body_line) - len(body_line.lstrip())
-            if line_indent <= indent:
-                break
-
-            # Determine body indentation from first body line
-            if body_indent is None:
-                body_indent = line_indent
-
-            # Strip the body indentation
-            if line_indent >= body_indent:
-                stripped = body_line[body_indent:]
-            else:
-                stripped = body_line.strip()
-            body_lines.append(stripped)
-            i += 1
-
-        # Clean up trailing empty lines
-        while body_lines and not body_lines[-1]:
-            body_lines.pop()
+        body, line = _collect_body(remaining, indent)
 
-        body = "\n".join(body_lines) if body_lines else None
+        # Track for parent lookup - use the - line indent
+        parent_stack[indent] = title.strip()
 
-        entry = CaptureEntry(
+        yield CaptureEntry(
             issue_type=issue_type,
             title=title.strip(),
             parent_title=parent_title,
             body=body,
         )
-        entries.append(entry)
 
-        # Track for parent lookup - use the - line indent
-        parent_stack[indent] = title.strip()
 
-    return entries
+def parse_capture_dsl(content: str) -> list[CaptureEntry]:
+    """Parse the indented DSL and return entries.
+
+    Supports multi-line body content indented below the type: title line.
+    Body uses --- separator for repeatable/non-repeatable sections.
+
+    Args:
+        content: DSL content with format "- type: title"
+
+    Returns:
+        List of CaptureEntry tuples with (type, title, parent_title, body)
+    """
+    return list(iter_capture_dsl(content.splitlines()))
+
+
+def capture_entries(service: IssueService, entries: Sequence[CaptureEntry]) -> list[str]:
+    """Create issues for parsed capture entries in a single batch.
+
+    Parents are resolved by title against entries earlier in the list; when
+    a title repeats, the most recent entry with that title wins.
+
+    Args:
+        service: The issue service to create issues with
+        entries: Entries as returned by parse_capture_dsl
+
+    Returns:
+        The created tw_ids, in entry order
+    """
+    drafts: list[IssueDraft] = []
+    title_to_index: dict[str, int] = {}
+
+    for index, entry in enumerate(entries):
+        parent_index = None
+        if entry.parent_title:
+            parent_index = title_to_index.get(entry.parent_title)
+
+        drafts.append(
+            IssueDraft(
+                issue_type=IssueType(entry.issue_type),
+                title=entry.title,
+                parent_index=parent_index,
+                body=entry.body,
+            )
+        )
+        title_to_index[entry.title] = index
+
+    return service.create_issues(drafts)
 
 
 @click.group(invoke_without_command=True)
@@ -265,7 +367,7 @@ def new(
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            console.print(json.dumps({"tw_id": tw_id}))
+            _echo_json({"tw_id": tw_id})
         else:
             console.print(f"Created {issue_type} {tw_id}")
 
@@ -285,7 +387,7 @@ def start(ctx: click.Context, tw_id: str) -> None:
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            console.print(json.dumps({"tw_id": tw_id, "status": "started"}))
+            _echo_json({"tw_id": tw_id, "status": "started"})
         else:
             console.print(f"Started work on {tw_id}")
 
@@ -315,7 +417,7 @@ def done(ctx: click.Context, tw_id: str, message: str, force: bool, recursive: b
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            console.print(json.dumps({"tw_id": tw_id, "status": "done"}))
+            _echo_json({"tw_id": tw_id, "status": "done"})
         else:
             console.print(f"Marked {tw_id} as done")
 
@@ -336,7 +438,7 @@ def blocked(ctx: click.Context, tw_id: str, reason: str) -> None:
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            console.print(json.dumps({"tw_id": tw_id, "status": "blocked"}))
+            _echo_json({"tw_id": tw_id, "status": "blocked"})
         else:
             console.print(f"Blocked {tw_id}: {reason}")
 
@@ -357,7 +459,7 @@ def unblock(ctx: click.Context, tw_id: str, message: str) -> None:
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            console.print(json.dumps({"tw_id": tw_id, "status": "unblocked"}))
+            _echo_json({"tw_id": tw_id, "status": "unblocked"})
         else:
             console.print(f"Unblocked {tw_id}")
 
@@ -386,7 +488,7 @@ def handoff(
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            console.print(json.dumps({"tw_id": tw_id, "status": "handed_off"}))
+            _echo_json({"tw_id": tw_id, "status": "handed_off"})
         else:
             console.print(f"Handed off {tw_id}")
 
@@ -407,7 +509,7 @@ def comment(ctx: click.Context, tw_id: str, message: str) -> None:
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            console.print(json.dumps({"tw_id": tw_id, "action": "commented"}))
+            _echo_json({"tw_id": tw_id, "action": "commented"})
         else:
             console.print(f"Added comment to {tw_id}")
 
@@ -427,7 +529,7 @@ def delete(ctx: click.Context, tw_id: str) -> None:
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            console.print(json.dumps({"tw_id": tw_id, "status": "deleted"}))
+            _echo_json({"tw_id": tw_id, "status": "deleted"})
         else:
             console.print(f"Deleted {tw_id}")
 
@@ -450,9 +552,7 @@ def record(ctx: click.Context, tw_id: str, record_type: str, message: str) -> No
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            console.print(
-                json.dumps({"tw_id": tw_id, "annotation_type": record_type})
-            )
+            _echo_json({"tw_id": tw_id, "annotation_type": record_type})
         else:
             console.print(f"Recorded {record_type} on {tw_id}")
 
@@ -473,27 +573,9 @@ def view(ctx: click.Context, tw_id: str) -> None:
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            output = {
-                "tw_id": issue.id,
-                "tw_type": issue.type.value,
-                "title": issue.title,
-                "tw_status": issue.status.value,
-                "tw_parent": issue.parent,
-                "tw_body": issue.body,
-                "tw_refs": issue.refs,
-                "created_at": issue.created_at.isoformat(),
-                "updated_at": issue.updated_at.isoformat(),
-                "annotations": [
-                    {
-                        "type": ann.type.value,
-                        "timestamp": ann.timestamp.isoformat(),
-                        "message": ann.message,
-                    }
-                    for ann in (issue.annotations or [])
-                ],
-            }
+            output = _issue_to_dict(issue)
             # Use click.echo for JSON to avoid Rich's word-wrapping
-            click.echo(json.dumps(output, indent=2))
+            _echo_json(output, indent=2)
         else:
             rendered = render_view(
                 issue, ancestors, siblings, descendants, referenced, referencing
@@ -551,6 +633,8 @@ def edit(
                 click.echo("No open issues to edit", err=True)
                 ctx.exit(1)
 
+            import questionary
+
             choices = [
                 questionary.Choice(
                     title=f"{issue.id}: {issue.title}",
@@ -562,7 +646,7 @@ def edit(
             selected = questionary.select(
                 "Select an issue to edit:",
                 choices=choices,
-                style=PROMPT_STYLE,
+                style=questionary.Style(_PROMPT_STYLE_RULES),
             ).ask()
 
             if selected is None:
@@ -590,7 +674,7 @@ def edit(
                     content = f.read()
 
                 new_title, new_body = parse_edited_content(content)
-                service.update_issue(tw_id, title=new_title, body=new_body)
+                updated = service.update_issue(tw_id, title=new_title, body=new_body)
 
             finally:
                 os.unlink(tmp_path)
@@ -599,11 +683,12 @@ def edit(
             if body == "-":
                 body = sys.stdin.read()
 
-            service.update_issue(tw_id, title=title, body=body)
+            updated = service.update_issue(tw_id, title=title, body=body)
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            console.print(json.dumps({"tw_id": tw_id}))
+            # Same shape as view --json, so callers need not view again
+            _echo_json(_issue_to_dict(updated), indent=2)
         else:
             console.print(f"Updated {tw_id}")
 
@@ -629,32 +714,11 @@ def tree(ctx: click.Context, tw_id: str | None) -> None:
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            def issue_to_dict(issue: Issue) -> dict[str, Any]:
-                return {
-                    "tw_id": issue.id,
-                    "tw_type": issue.type.value,
-                    "title": issue.title,
-                    "tw_status": issue.status.value,
-                    "tw_parent": issue.parent,
-                    "tw_body": issue.body,
-                    "tw_refs": issue.refs,
-                    "created_at": issue.created_at.isoformat(),
-                    "updated_at": issue.updated_at.isoformat(),
-                    "annotations": [
-                        {
-                            "type": ann.type.value,
-                            "timestamp": ann.timestamp.isoformat(),
-                            "message": ann.message,
-                        }
-                        for ann in (issue.annotations or [])
-                    ],
-                }
-
             output = {
-                "hierarchy": [issue_to_dict(issue) for issue in hierarchy],
-                "backlog": [issue_to_dict(issue) for issue in backlog],
+                "hierarchy": [_issue_to_dict(issue) for issue in hierarchy],
+                "backlog": [_issue_to_dict(issue) for issue in backlog],
             }
-            console.print(json.dumps(output, indent=2))
+            _echo_json(output, indent=2)
         else:
             console.print(render_tree_with_backlog(hierarchy, backlog), markup=True)
 
@@ -664,13 +728,13 @@ def tree(ctx: click.Context, tw_id: str | None) -> None:
 
 
 @main.command()
-@click.argument("subcommand")
+@click.argument("subcommand", type=click.Choice(["tree"]))
 @click.argument("tw_id", required=False, default=None)
 @click.option(
     "-n",
     "--interval",
     default=60,
-    type=int,
+    type=click.IntRange(min=1),
     help="Refresh interval in seconds (default: 60)",
 )
 @click.pass_context
@@ -684,13 +748,7 @@ def watch(ctx: click.Context, subcommand: str, tw_id: str | None, interval: int)
         tw watch tree TW-30        # Watch specific issue
         tw watch tree -n 10        # Custom interval
     """
-    if subcommand != "tree":
-        click.echo("error: only 'tree' subcommand is supported", err=True)
-        ctx.exit(1)
-
-    if interval <= 0:
-        click.echo("error: interval must be positive", err=True)
-        ctx.exit(1)
+    from tw import watch as watch_module
 
     try:
         service = get_service(ctx)
@@ -715,49 +773,11 @@ def digest(ctx: click.Context, tw_id: str) -> None:
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            parent_dict = {
-                "tw_id": parent.id,
-                "tw_type": parent.type.value,
-                "title": parent.title,
-                "tw_status": parent.status.value,
-                "tw_parent": parent.parent,
-                "tw_body": parent.body,
-                "tw_refs": parent.refs,
-                "created_at": parent.created_at.isoformat(),
-                "updated_at": parent.updated_at.isoformat(),
-                "annotations": [
-                    {
-                        "type": ann.type.value,
-                        "timestamp": ann.timestamp.isoformat(),
-                        "message": ann.message,
-                    }
-                    for ann in (parent.annotations or [])
-                ],
+            output = {
+                "parent": _issue_to_dict(parent),
+                "children": [_issue_to_dict(child) for child in children],
             }
-            children_list = [
-                {
-                    "tw_id": child.id,
-                    "tw_type": child.type.value,
-                    "title": child.title,
-                    "tw_status": child.status.value,
-                    "tw_parent": child.parent,
-                    "tw_body": child.body,
-                    "tw_refs": child.refs,
-                    "created_at": child.created_at.isoformat(),
-                    "updated_at": child.updated_at.isoformat(),
-                    "annotations": [
-                        {
-                            "type": ann.type.value,
-                            "timestamp": ann.timestamp.isoformat(),
-                            "message": ann.message,
-                        }
-                        for ann in (child.annotations or [])
-                    ],
-                }
-                for child in children
-            ]
-            output = {"parent": parent_dict, "children": children_list}
-            console.print(json.dumps(output, indent=2))
+            _echo_json(output, indent=2)
         else:
             console.print(render_digest(parent, children))
 
@@ -786,7 +806,7 @@ def capture(ctx: click.Context, input_source: str | None) -> None:
         service = get_service(ctx)
 
         if input_source == "-":
-            content = sys.stdin.read()
+            entries = list(iter_capture_dsl(sys.stdin))
         elif input_source is None:
             editor = os.environ.get("EDITOR", "vi")
             template = """\n\n# Capture issues using indented DSL
@@ -807,7 +827,7 @@ def capture(ctx: click.Context, input_source: str | None) -> None:
             try:
                 subprocess.run([editor, temp_path], check=True)
                 with open(temp_path) as f:
-                    content = f.read()
+                    entries = list(iter_capture_dsl(f))
             finally:
                 os.unlink(temp_path)
         else:
@@ -815,33 +835,20 @@ def capture(ctx: click.Context, input_source: str | None) -> None:
             ctx.exit(1)
             return
 
-        entries = parse_capture_dsl(content)
-
-        created: list[dict[str, str]] = []
-        title_to_id: dict[str, str] = {}
-
-        for entry in entries:
-            parent_id = None
-            if entry.parent_title:
-                parent_id = title_to_id.get(entry.parent_title)
-
-            tw_id = service.create_issue(
-                issue_type=IssueType(entry.issue_type),
-                title=entry.title,
-                parent_id=parent_id,
-                body=entry.body,
-            )
-
-            title_to_id[entry.title] = tw_id
-            created.append({"tw_id": tw_id, "title": entry.title})
+        tw_ids = capture_entries(service, entries)
+        created = [
+            {"tw_id": tw_id, "title": entry.title}
+            for tw_id, entry in zip(tw_ids, entries, strict=True)
+        ]
 
         console: Console = ctx.obj["stdout"]
         if ctx.obj["json"]:
-            click.echo(json.dumps({"created": created}))
+            _echo_json({"created": created})
         else:
             if created:
-                for item in created:
-                    console.print(f"Created {item['tw_id']}: {item['title']}")
+                console.print(
+                    "\n".join(f"Created {item['tw_id']}: {item['title']}" for item in created)
+                )
             else:
                 console.print("No issues created")
 
@@ -850,6 +857,48 @@ def capture(ctx: click.Context, input_source: str | None) -> None:
         ctx.exit(1)
 
 
+@main.command()
+@click.pass_context
+def batch(ctx: click.Context) -> None:
+    """Run tw commands read from stdin, one per line.
+
+    Each line is split like a shell command line, without the leading
+    "tw"; blank lines and # comments are skipped. Commands run in order in
+    this process and share the global options given before "batch".
+    Stops at the first command that fails, exiting with its status.
+    """
+    for lineno, line in enumerate(sys.stdin, start=1):
+        try:
+            args = shlex.split(line, comments=True)
+        except ValueError as e:
+            # Unbalanced quotes
+            click.echo(f"error: line {lineno}: {e}", err=True)
+            ctx.exit(1)
+        if not args:
+            continue
+
+        try:
+            cmd_name, cmd, cmd_args = main.resolve_command(ctx, args)
+            if cmd is None or cmd is batch:
+                raise click.UsageError(f"cannot run {args[0]!r} in a batch")
+
+            with cmd.make_context(cmd_name, cmd_args, parent=ctx) as sub_ctx:
+                stdin_param = _STDIN_PARAMS.get(cmd.name or "")
+                if stdin_param is not None and sub_ctx.params.get(stdin_param) == "-":
+                    # stdin is the batch script itself
+                    raise click.UsageError(f"cannot read stdin in a batch: {line.strip()}")
+                cmd.invoke(sub_ctx)
+
+        except click.exceptions.Exit as e:
+            # Commands report their own errors before exiting non-zero
+            if e.exit_code != 0:
+                click.echo(f"error: line {lineno}: {line.strip()}", err=True)
+                ctx.exit(e.exit_code)
+        except click.ClickException as e:
+            click.echo(f"error: line {lineno}: {e.format_message()}", err=True)
+            ctx.exit(e.exit_code)
+
+
 @main.command()
 @click.pass_context
 def groom(ctx: click.Context) -> None:
@@ -917,7 +966,7 @@ def groom(ctx: click.Context) -> None:
                 summary["unchanged"] += 1
 
         if ctx.obj["json"]:
-            click.echo(json.dumps(summary))
+            _echo_json(summary)
         else:
             console.print(
                 f"Groomed: {summary['resolved']} resolved, "
@@ -934,6 +983,8 @@ def groom(ctx: click.Context) -> None:
 def tui(ctx: click.Context) -> None:
     """Launch the interactive TUI for tw issue tracker."""
     try:
+        from tw.tui import run_tui
+
         run_tui()
     except Exception as e:
         click.echo(f"error: {e}", err=True)
@@ -953,6 +1004,9 @@ def claude_cmd(
 
     If no issue ID is provided, shows an interactive selection of actionable issues.
     """
+    import questionary
+
+    prompt_style = questionary.Style(_PROMPT_STYLE_RULES)
     try:
         service = get_service(ctx)
 
@@ -971,7 +1025,7 @@ def claude_cmd(
             selected = questionary.autocomplete(
                 "Select an issue:",
                 choices=choices,
-                style=PROMPT_STYLE,
+                style=prompt_style,
             ).ask()
 
             if selected is None:
@@ -979,16 +1033,16 @@ def claude_cmd(
 
             tw_id = selected.split(":")[0]
 
-        model = None
-        if sum([opus, sonnet, haiku]) > 1:
+        flagged = [
+            name
+            for name, flag in (("opus", opus), ("sonnet", sonnet), ("haiku", haiku))
+            if flag
+        ]
+        if len(flagged) > 1:
             click.echo("error: only one model flag can be specified", err=True)
             ctx.exit(1)
-        elif opus:
-            model = "opus"
-        elif sonnet:
-            model = "sonnet"
-        elif haiku:
-            model = "haiku"
+        elif flagged:
+            model = flagged[0]
         else:
             model_choice = questionary.select(
                 "Select model:",
@@ -997,7 +1051,7 @@ def claude_cmd(
                     questionary.Choice("Sonnet", value="sonnet"),
                     questionary.Choice("Haiku", value="haiku"),
                 ],
-                style=PROMPT_STYLE,
+                style=prompt_style,
             ).ask()
 
             if model_choice is None:
@@ -1013,7 +1067,7 @@ def claude_cmd(
         )
         child_count = sum(1 for d in descendants if d.parent == issue.id)
         prompt = build_claude_prompt(brief_output, child_count, issue.id)
-        subprocess.run(["claude", "--dangerously-skip-permissions", "--model", model, prompt])
+        subprocess.run([*_CLAUDE_ARGV, *_MODEL_ARGS[model], prompt])
     except Exception as e:
         click.echo(f"error: {e}", err=True)
         ctx.exit(1)
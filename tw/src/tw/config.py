@@ -47,3 +47,31 @@ def get_prefix() -> str:
     raise ConfigError(
         "Neither TW_PREFIX nor TW_PROJECT_PREFIX environment variable is set"
     )
+
+
+SQLITE_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+def get_sqlite_synchronous() -> str | None:
+    """Get the SQLite synchronous mode from TW_SQLITE_SYNCHRONOUS.
+
+    OFF skips fsync on commit, trading durability on power loss for
+    speed; it is meant for throwaway databases such as test fixtures.
+
+    Returns:
+        The mode in upper case, or None to keep SQLite's default.
+
+    Raises:
+        ConfigError: If the value is not a recognized mode.
+    """
+    mode = os.environ.get("TW_SQLITE_SYNCHRONOUS")
+    if not mode:
+        return None
+
+    mode = mode.upper()
+    if mode not in SQLITE_SYNCHRONOUS_MODES:
+        raise ConfigError(
+            f"TW_SQLITE_SYNCHRONOUS must be one of {', '.join(SQLITE_SYNCHRONOUS_MODES)}, "
+            f"got {mode!r}"
+        )
+    return mode
@@ -1,8 +1,11 @@
 """ID parsing and sorting utilities."""
 
 import re
+from collections.abc import Iterable
 from dataclasses import dataclass
 
+_ID_RE = re.compile(r"^([A-Z]+)-(\d+)(?:-(\d+)([a-z]+)?)?$")
+
 
 @dataclass
 class ParsedId:
@@ -20,8 +23,7 @@ def parse_id(tw_id: str) -> ParsedId:
     Raises:
         ValueError: If the ID format is invalid.
     """
-    pattern = r"^([A-Z]+)-(\d+)(?:-(\d+)([a-z]+)?)?$"
-    match = re.match(pattern, tw_id)
+    match = _ID_RE.match(tw_id)
     if not match:
         raise ValueError(f"Invalid tw_id format: {tw_id}")
 
@@ -44,14 +46,13 @@ def parse_id_sort_key(tw_id: str) -> tuple[str, int, int, int, str]:
     4. By task suffix length (shorter first)
     5. By task suffix (alphabetically)
     """
-    parsed = parse_id(tw_id)
-    return (
-        parsed.prefix,
-        parsed.epic_num,
-        parsed.story_num or 0,
-        len(parsed.task_suffix) if parsed.task_suffix else 0,
-        parsed.task_suffix or "",
-    )
+    match = _ID_RE.match(tw_id)
+    if not match:
+        raise ValueError(f"Invalid tw_id format: {tw_id}")
+
+    prefix, epic_str, story_str, task_suffix = match.groups()
+    suffix = task_suffix or ""
+    return (prefix, int(epic_str), int(story_str or 0), len(suffix), suffix)
 
 
 def sort_ids(ids: list[str]) -> list[str]:
@@ -72,23 +73,111 @@ def _int_to_task_suffix(n: int) -> str:
     return result
 
 
-def _get_max_epic_num(prefix: str, existing_ids: list[str]) -> int:
-    """Find the maximum epic number in use (including reserved by orphans)."""
-    max_num = 0
-    for tw_id in existing_ids:
-        try:
-            parsed = parse_id(tw_id)
-            if parsed.prefix == prefix:
-                max_num = max(max_num, parsed.epic_num)
-        except ValueError:
-            continue
-    return max_num
+def _task_suffix_to_int(suffix: str) -> int:
+    """Convert task suffix to 0-based integer (a -> 0, z -> 25, aa -> 26, ...).
+
+    Inverse of _int_to_task_suffix. Ordering by the result matches ordering
+    suffixes by length and then alphabetically.
+    """
+    n = 0
+    for c in suffix:
+        n = n * 26 + (ord(c) - ord("a") + 1)
+    return n - 1
+
+
+class IdIndex:
+    """Highest allocated numbers per prefix, epic, and story.
+
+    Building the index parses every existing tw_id once; each allocation
+    afterwards is a dictionary lookup. Callers that allocate several IDs
+    against the same set of existing IDs should build one index and
+    record() each new ID instead of rescanning the list per allocation.
+    """
+
+    def __init__(self, existing_ids: Iterable[str] = ()) -> None:
+        self._epics: dict[str, int] = {}
+        self._stories: dict[tuple[str, int], int] = {}
+        self._epic_children: dict[tuple[str, int], int] = {}
+        self._task_nums: dict[tuple[str, int, int], int] = {}
+        for tw_id in existing_ids:
+            self.record(tw_id)
+
+    def record(self, tw_id: str) -> None:
+        """Add a tw_id to the index; invalid IDs are ignored."""
+        match = _ID_RE.match(tw_id)
+        if not match:
+            return
+        prefix, epic_str, story_str, task_suffix = match.groups()
+        epic_num = int(epic_str)
+        if epic_num > self._epics.get(prefix, 0):
+            self._epics[prefix] = epic_num
+        if story_str is None:
+            return
+
+        story_num = int(story_str)
+        epic_key = (prefix, epic_num)
+        if story_num > self._stories.get(epic_key, 0):
+            self._stories[epic_key] = story_num
+        if task_suffix is None:
+            if story_num > self._epic_children.get(epic_key, 0):
+                self._epic_children[epic_key] = story_num
+            return
+
+        story_key = (prefix, epic_num, story_num)
+        task_num = _task_suffix_to_int(task_suffix)
+        if task_num > self._task_nums.get(story_key, -1):
+            self._task_nums[story_key] = task_num
+
+    def next_epic_id(self, prefix: str) -> str:
+        """Return the next available epic ID."""
+        return f"{prefix}-{self._epics.get(prefix, 0) + 1}"
+
+    def next_story_id(self, parent_id: str | None, prefix: str | None = None) -> str:
+        """Return the next available story ID.
+
+        Args:
+            parent_id: The parent epic's tw_id, or None for orphan
+            prefix: Required if parent_id is None
+        """
+        if parent_id is None:
+            if prefix is None:
+                raise ValueError("prefix required for orphan story")
+            return self.next_epic_id(prefix)
+
+        parsed_parent = parse_id(parent_id)
+        prefix = parsed_parent.prefix
+        epic_num = parsed_parent.epic_num
+        return f"{prefix}-{epic_num}-{self._stories.get((prefix, epic_num), 0) + 1}"
+
+    def next_task_id(self, parent_id: str | None, prefix: str | None = None) -> str:
+        """Return the next available task ID.
+
+        Args:
+            parent_id: The parent story's tw_id, or None for orphan
+            prefix: Required if parent_id is None
+        """
+        if parent_id is None:
+            if prefix is None:
+                raise ValueError("prefix required for orphan task")
+            return self.next_epic_id(prefix)
+
+        parsed_parent = parse_id(parent_id)
+        prefix = parsed_parent.prefix
+        epic_num = parsed_parent.epic_num
+        story_num = parsed_parent.story_num
+
+        if story_num is None:
+            max_child = self._epic_children.get((prefix, epic_num), 0)
+            return f"{prefix}-{epic_num}-{max_child + 1}"
+
+        max_task = self._task_nums.get((prefix, epic_num, story_num), -1)
+        next_suffix = _int_to_task_suffix(max_task + 1)
+        return f"{prefix}-{epic_num}-{story_num}{next_suffix}"
 
 
 def generate_next_epic_id(prefix: str, existing_ids: list[str]) -> str:
     """Generate the next available epic ID."""
-    max_num = _get_max_epic_num(prefix, existing_ids)
-    return f"{prefix}-{max_num + 1}"
+    return IdIndex(existing_ids).next_epic_id(prefix)
 
 
 def generate_next_story_id(
@@ -103,30 +192,7 @@ def generate_next_story_id(
         existing_ids: All existing tw_ids in the project
         prefix: Required if parent_id is None
     """
-    if parent_id is None:
-        if prefix is None:
-            raise ValueError("prefix required for orphan story")
-        max_epic = _get_max_epic_num(prefix, existing_ids)
-        return f"{prefix}-{max_epic + 1}"
-
-    parsed_parent = parse_id(parent_id)
-    prefix = parsed_parent.prefix
-    epic_num = parsed_parent.epic_num
-
-    max_story = 0
-    for tw_id in existing_ids:
-        try:
-            parsed = parse_id(tw_id)
-            if (
-                parsed.prefix == prefix
-                and parsed.epic_num == epic_num
-                and parsed.story_num is not None
-            ):
-                max_story = max(max_story, parsed.story_num)
-        except ValueError:
-            continue
-
-    return f"{prefix}-{epic_num}-{max_story + 1}"
+    return IdIndex(existing_ids).next_story_id(parent_id, prefix)
 
 
 def generate_next_task_id(
@@ -141,58 +207,4 @@ def generate_next_task_id(
         existing_ids: All existing tw_ids in the project
         prefix: Required if parent_id is None
     """
-    if parent_id is None:
-        if prefix is None:
-            raise ValueError("prefix required for orphan task")
-        max_epic = _get_max_epic_num(prefix, existing_ids)
-        return f"{prefix}-{max_epic + 1}"
-
-    parsed_parent = parse_id(parent_id)
-    prefix = parsed_parent.prefix
-    epic_num = parsed_parent.epic_num
-    story_num = parsed_parent.story_num
-
-    if story_num is None:
-        max_child = 0
-        for tw_id in existing_ids:
-            try:
-                parsed = parse_id(tw_id)
-                if (
-                    parsed.prefix == prefix
-                    and parsed.epic_num == epic_num
-                    and parsed.story_num is not None
-                    and parsed.task_suffix is None
-                ):
-                    max_child = max(max_child, parsed.story_num)
-            except ValueError:
-                continue
-
-        return f"{prefix}-{epic_num}-{max_child + 1}"
-
-    existing_suffixes: list[str] = []
-    for tw_id in existing_ids:
-        try:
-            parsed = parse_id(tw_id)
-            if (
-                parsed.prefix == prefix
-                and parsed.epic_num == epic_num
-                and parsed.story_num == story_num
-                and parsed.task_suffix is not None
-            ):
-                existing_suffixes.append(parsed.task_suffix)
-        except ValueError:
-            continue
-
-    if not existing_suffixes:
-        next_suffix = "a"
-    else:
-        sorted_suffixes = sorted(existing_suffixes, key=lambda s: (len(s), s))
-        max_suffix = sorted_suffixes[-1]
-        if all(c == "z" for c in max_suffix):
-            next_suffix = "a" * (len(max_suffix) + 1)
-        elif max_suffix[-1] == "z":
-            next_suffix = max_suffix[:-1][:-1] + chr(ord(max_suffix[:-1][-1]) + 1) + "a"
-        else:
-            next_suffix = max_suffix[:-1] + chr(ord(max_suffix[-1]) + 1)
-
-    return f"{prefix}-{epic_num}-{story_num}{next_suffix}"
+    return IdIndex(existing_ids).next_task_id(parent_id, prefix)
@@ -4,6 +4,9 @@ from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
+# Divides an issue body into its repeatable and non-repeatable sections
+_BODY_SEPARATOR = "\n---\n"
+
 
 class IssueType(str, Enum):
     """Type of issue in the hierarchy."""
@@ -44,7 +47,7 @@ class AnnotationType(str, Enum):
     COMMENT = "comment"
 
 
-@dataclass
+@dataclass(slots=True)
 class Annotation:
     """An annotation on an issue."""
 
@@ -57,7 +60,7 @@ class Annotation:
         return f"[{self.type.value}] {self.message}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Issue:
     """An issue (epic, story, or task)."""
 
@@ -82,13 +85,13 @@ class Issue:
         """Return the repeatable portion of the body (before ---)."""
         if self.body is None:
             return ""
-        return self.body.partition("\n---\n")[0].strip()
+        return self.body.partition(_BODY_SEPARATOR)[0].strip()
 
     def get_nonrepeatable_body(self) -> str:
         """Return the non-repeatable portion of the body (after ---)."""
         if self.body is None:
             return ""
-        return self.body.partition("\n---\n")[2].strip()
+        return self.body.partition(_BODY_SEPARATOR)[2].strip()
 
     def get_full_body(self) -> str | None:
         """Return the complete body."""
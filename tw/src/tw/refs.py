@@ -1,10 +1,18 @@
 """References extraction utilities."""
 
 import re
+from collections.abc import Iterable
+from functools import cache
 
 from tw.ids import sort_ids
 
 
+@cache
+def _ref_pattern(prefix: str) -> re.Pattern[str]:
+    """Return the compiled reference pattern for a project prefix."""
+    return re.compile(rf"\b({re.escape(prefix)}-\d+(?:-\d+[a-z]*)?)\b")
+
+
 def extract_refs(text: str, prefix: str) -> list[str]:
     """Extract and sort tw_id references from text.
 
@@ -15,7 +23,28 @@ def extract_refs(text: str, prefix: str) -> list[str]:
     Returns:
         Sorted, deduplicated list of referenced tw_ids
     """
-    pattern = rf"\b({re.escape(prefix)}-\d+(?:-\d+[a-z]*)?)\b"
-    matches = re.findall(pattern, text)
-    unique = list(set(matches))
-    return sort_ids(unique)
+    # Most bodies mention no issue at all; a substring check rules them out
+    # without running the regex.
+    if f"{prefix}-" not in text:
+        return []
+    matches = _ref_pattern(prefix).findall(text)
+    return sort_ids(list(dict.fromkeys(matches)))
+
+
+def extract_refs_many(texts: Iterable[str], prefix: str) -> list[str]:
+    """Extract and sort the tw_id references found across several texts.
+
+    Args:
+        texts: The texts to scan for references
+        prefix: The project prefix to match (e.g., "PROJ")
+
+    Returns:
+        Sorted list of referenced tw_ids, deduplicated across all texts
+    """
+    pattern = _ref_pattern(prefix)
+    marker = f"{prefix}-"
+    seen: dict[str, None] = {}
+    for text in texts:
+        if marker in text:
+            seen.update(dict.fromkeys(pattern.findall(text)))
+    return sort_ids(list(seen))
@@ -1,5 +1,6 @@
 """Jinja template rendering for human-readable output."""
 
+import re
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
@@ -8,6 +9,12 @@ from jinja2 import Environment, FileSystemLoader
 
 from tw.models import Annotation, AnnotationType, Issue
 
+# Groom editor "# TEST-1 (bug)" id comments
+_GROOM_ID_RE = re.compile(r"^#\s*([A-Z]+-\d+(?:-\d+)?(?:[a-z]+)?)\s*\(")
+
+# Start of a "- type: title" entry; shared by the groom and capture DSLs
+ENTRY_START_RE = re.compile(r"^\s*-\s*(epic|story|task|bug|idea):")
+
 _TEMPLATE_DIR = Path(__file__).parent / "templates"
 _env = Environment(loader=FileSystemLoader(_TEMPLATE_DIR), trim_blocks=True, lstrip_blocks=True)
 
@@ -148,10 +155,7 @@ def render_issue_tree_line(issue: Issue, depth: int = 0) -> str:
     result = [line]
 
     if issue.body:
-        if '---' in issue.body:
-            repeatable_body = issue.body.split('---')[0].strip()
-        else:
-            repeatable_body = issue.body.strip()
+        repeatable_body = issue.body.partition('---')[0].strip()
         if repeatable_body:
             for body_line in repeatable_body.splitlines():
                 result.append(f"[dim]{indent}  {body_line}[/dim]")
@@ -291,10 +295,7 @@ def render_view(
 
     # Repeatable body (default text color)
     if issue.body:
-        if '---' in issue.body:
-            repeatable_body = issue.body.split('---')[0].strip()
-        else:
-            repeatable_body = issue.body.strip()
+        repeatable_body = issue.body.partition('---')[0].strip()
         if repeatable_body:
             lines.append("")
             lines.append(repeatable_body)
@@ -329,13 +330,13 @@ def render_view(
                 lines.append(_render_annotation_short(ann))
 
     # Non-repeatable body
-    if issue.body and '---' in issue.body:
-        parts = issue.body.split('---', 1)
-        if len(parts) > 1 and parts[1].strip():
+    if issue.body:
+        nonrepeatable_body = issue.body.partition('---')[2].strip()
+        if nonrepeatable_body:
             lines.append("")
             lines.append("[gray69]---[/gray69]")
             lines.append("")
-            lines.append(parts[1].strip())
+            lines.append(nonrepeatable_body)
 
     # Full annotations
     if issue.annotations:
@@ -382,10 +383,7 @@ def render_view_body(issue: Issue) -> str:
                 break
 
     if issue.body:
-        if '---' in issue.body:
-            repeatable_body = issue.body.split('---')[0].strip()
-        else:
-            repeatable_body = issue.body.strip()
+        repeatable_body = issue.body.partition('---')[0].strip()
         if repeatable_body:
             lines.append("")
             lines.append(repeatable_body)
@@ -401,13 +399,13 @@ def render_view_body(issue: Issue) -> str:
                 first_line = ann.message.split('\n')[0].strip()
                 lines.append(f"- **{ann.type.value}:** {first_line}")
 
-    if issue.body and '---' in issue.body:
-        parts = issue.body.split('---', 1)
-        if len(parts) > 1 and parts[1].strip():
+    if issue.body:
+        nonrepeatable_body = issue.body.partition('---')[2].strip()
+        if nonrepeatable_body:
             lines.append("")
             lines.append("---")
             lines.append("")
-            lines.append(parts[1].strip())
+            lines.append(nonrepeatable_body)
 
     return "\n".join(lines)
 
@@ -594,9 +592,9 @@ def parse_groom_result(
     Returns:
         List of GroomAction objects describing what to do
     """
-    import re
+    from itertools import islice
 
-    from tw.cli import CaptureEntry, parse_capture_dsl
+    from tw.cli import CaptureEntry, iter_capture_dsl
 
     actions: list[GroomAction] = []
     seen_ids: set[str] = set()
@@ -612,19 +610,17 @@ def parse_groom_result(
 
         # Check for ID comment: # TEST-1 (bug)
         if line.startswith("#") and "(" in line and ")" in line:
-            match = re.match(r'^#\s*([A-Z]+-\d+(?:-\d+)?(?:[a-z]+)?)\s*\(', line)
+            match = _GROOM_ID_RE.match(line)
             if match:
                 current_id = match.group(1)
                 i += 1
                 continue
 
         # Check for entry start
-        if re.match(r'^\s*-\s*(epic|story|task|bug|idea):', line):
+        if ENTRY_START_RE.match(line):
             # Parse from this point using capture DSL
-            remaining = "\n".join(lines[i:])
-            entries = parse_capture_dsl(remaining)
-            if entries:
-                entry = entries[0]
+            entry = next(iter_capture_dsl(islice(lines, i, None)), None)
+            if entry is not None:
                 if current_id not in entries_by_id:
                     entries_by_id[current_id] = []
                 entries_by_id[current_id].append(entry)
@@ -635,8 +631,7 @@ def parse_groom_result(
                 i += 1
                 while i < len(lines):
                     next_line = lines[i]
-                    issue_pattern = r'^\s*-\s*(epic|story|task|bug|idea):'
-                    if next_line.startswith("#") or re.match(issue_pattern, next_line):
+                    if next_line.startswith("#") or ENTRY_START_RE.match(next_line):
                         break
                     i += 1
                 current_id = None
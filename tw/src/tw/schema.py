@@ -3,11 +3,17 @@
 import sqlite3
 from pathlib import Path
 
+# Stored in PRAGMA user_version once schema.sql has been applied. Bump this
+# whenever schema.sql changes so existing databases pick up the new DDL.
+SCHEMA_VERSION = 1
+
 
 def init_db(db_path: Path) -> None:
     """Initialize the database with schema.
 
     Creates the issues and annotations tables with indexes if they don't exist.
+    Databases already stamped with SCHEMA_VERSION are left untouched, so
+    opening an existing database costs a single pragma read.
 
     Args:
         db_path: Path to the SQLite database file.
@@ -16,11 +22,16 @@ def init_db(db_path: Path) -> None:
         FileNotFoundError: If schema.sql cannot be found.
         sqlite3.DatabaseError: If database initialization fails.
     """
-    schema_file = Path(__file__).parent / "schema.sql"
-    schema_sql = schema_file.read_text()
-
     with sqlite3.connect(db_path) as conn:
+        (user_version,) = conn.execute("PRAGMA user_version").fetchone()
+        if user_version >= SCHEMA_VERSION:
+            return
+
+        schema_file = Path(__file__).parent / "schema.sql"
+        schema_sql = schema_file.read_text()
+
         conn.execute("PRAGMA foreign_keys = ON")
         cursor = conn.cursor()
         cursor.executescript(schema_sql)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
@@ -1,16 +1,38 @@
 """Issue service layer."""
 
 import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import UTC, datetime
 
 from tw.backend import SqliteBackend
-from tw.ids import generate_next_epic_id, generate_next_story_id, generate_next_task_id
+from tw.ids import IdIndex, generate_next_epic_id, generate_next_story_id, generate_next_task_id
 from tw.models import Annotation, AnnotationType, Issue, IssueStatus, IssueType
 from tw.refs import extract_refs
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class IssueDraft:
+    """An issue to be created by IssueService.create_issues.
+
+    Attributes:
+        issue_type: The type of issue to create
+        title: The issue title
+        parent_id: Optional tw_id of an existing parent
+        parent_index: Optional index of an earlier draft in the same batch
+            to use as the parent; takes precedence over parent_id
+        body: Optional body text
+    """
+
+    issue_type: IssueType
+    title: str
+    parent_id: str | None = None
+    parent_index: int | None = None
+    body: str | None = None
+
+
 class IssueService:
     """High-level operations on issues."""
 
@@ -59,49 +81,85 @@ class IssueService:
         Raises:
             ValueError: If the parent type is invalid for this issue type
         """
-        from tw.models import is_backlog_type
+        draft = IssueDraft(issue_type=issue_type, title=title, parent_id=parent_id, body=body)
+        return self.create_issues([draft])[0]
 
-        # Validate backlog items cannot have parents
-        if is_backlog_type(issue_type) and parent_id is not None:
-            raise ValueError(f"{issue_type.value} issues cannot have a parent")
+    def create_issues(self, drafts: Iterable[IssueDraft]) -> list[str]:
+        """Create several issues in a single backend transaction.
 
-        # Validate parent is not a backlog item
-        if parent_id is not None:
-            parent = self.get_issue(parent_id)
-            if is_backlog_type(parent.type):
-                raise ValueError(f"{parent.type.value} issues cannot have children")
+        A draft may name its parent either by tw_id or by the index of an
+        earlier draft in the same batch. Every draft is validated before
+        anything is written, so a failure leaves the database unchanged.
 
-        existing_ids = self._get_all_ids(include_deleted=True)
+        Args:
+            drafts: The issues to create, parents before children
+
+        Returns:
+            The generated tw_ids, in draft order
+
+        Raises:
+            ValueError: If a parent type is invalid or a parent_index does not
+                refer to an earlier draft
+            KeyError: If a parent tw_id is not found
+        """
+        from tw.models import is_backlog_type
 
-        # Generate ID based on type
-        if issue_type == IssueType.EPIC or is_backlog_type(issue_type):
-            tw_id = generate_next_epic_id(self._prefix, existing_ids)
-        elif issue_type == IssueType.STORY:
-            tw_id = generate_next_story_id(parent_id, existing_ids, prefix=self._prefix)
-        else:  # TASK
-            tw_id = generate_next_task_id(parent_id, existing_ids, prefix=self._prefix)
+        id_index = IdIndex(self._get_all_ids(include_deleted=True))
+        issues: list[Issue] = []
 
-        # Extract references from body
-        tw_refs: list[str] = []
-        if body:
-            tw_refs = extract_refs(body, self._prefix)
+        for index, draft in enumerate(drafts):
+            parent_id = draft.parent_id
+            if draft.parent_index is not None:
+                if not 0 <= draft.parent_index < index:
+                    raise ValueError(f"invalid parent index {draft.parent_index}")
+                parent_id = issues[draft.parent_index].id
 
-        now = datetime.now(UTC)
-        issue = Issue(
-            id=tw_id,
-            type=issue_type,
-            title=title,
-            status=IssueStatus.NEW,
-            created_at=now,
-            updated_at=now,
-            parent=parent_id,
-            body=body,
-            refs=tw_refs,
-        )
+            # Validate backlog items cannot have parents
+            if is_backlog_type(draft.issue_type) and parent_id is not None:
+                raise ValueError(f"{draft.issue_type.value} issues cannot have a parent")
 
-        self._save_issue(issue)
-        logger.debug(f"Created {issue_type.value} {tw_id}: {title}")
-        return tw_id
+            # Validate parent is not a backlog item
+            if parent_id is not None:
+                if draft.parent_index is not None:
+                    parent_type = issues[draft.parent_index].type
+                else:
+                    parent_type = self.get_issue(parent_id).type
+                if is_backlog_type(parent_type):
+                    raise ValueError(f"{parent_type.value} issues cannot have children")
+
+            # Generate ID based on type
+            if draft.issue_type == IssueType.EPIC or is_backlog_type(draft.issue_type):
+                tw_id = id_index.next_epic_id(self._prefix)
+            elif draft.issue_type == IssueType.STORY:
+                tw_id = id_index.next_story_id(parent_id, prefix=self._prefix)
+            else:  # TASK
+                tw_id = id_index.next_task_id(parent_id, prefix=self._prefix)
+            id_index.record(tw_id)
+
+            # Extract references from body
+            tw_refs: list[str] = []
+            if draft.body:
+                tw_refs = extract_refs(draft.body, self._prefix)
+
+            now = datetime.now(UTC)
+            issues.append(
+                Issue(
+                    id=tw_id,
+                    type=draft.issue_type,
+                    title=draft.title,
+                    status=IssueStatus.NEW,
+                    created_at=now,
+                    updated_at=now,
+                    parent=parent_id,
+                    body=draft.body,
+                    refs=tw_refs,
+                )
+            )
+
+        self._backend.insert_issues(issues)
+        for issue in issues:
+            logger.debug(f"Created {issue.type.value} {issue.id}: {issue.title}")
+        return [issue.id for issue in issues]
 
     def get_issue(self, tw_id: str) -> Issue:
         """Get an issue by tw_id.
@@ -228,25 +286,30 @@ class IssueService:
         Raises:
             KeyError: If root_id is provided but the issue is not found.
         """
+        return self._build_issue_tree(self.get_all_issues(), root_id)
+
+    def _build_issue_tree(self, all_issues: list[Issue], root_id: str | None) -> list[Issue]:
+        """Arrange already-loaded issues into tree order (see get_issue_tree)."""
         from tw.ids import parse_id_sort_key
 
-        all_issues = self.get_all_issues()
+        issue_by_id = {issue.id: issue for issue in all_issues}
 
-        if root_id is not None:
-            root_issue = None
-            for issue in all_issues:
-                if issue.id == root_id:
-                    root_issue = issue
-                    break
+        # Build the parent -> children adjacency once, each list sorted by ID,
+        # so every lookup below is a dict hit instead of a scan of all issues.
+        children_by_parent: dict[str, list[Issue]] = {}
+        for issue in sorted(all_issues, key=lambda i: parse_id_sort_key(i.id)):
+            if issue.parent is not None:
+                children_by_parent.setdefault(issue.parent, []).append(issue)
 
+        if root_id is not None:
+            root_issue = issue_by_id.get(root_id)
             if root_issue is None:
                 raise KeyError(f"Issue {root_id} not found")
 
             def get_all_descendants(issue_id: str) -> list[Issue]:
                 """Recursively get all descendants of an issue."""
                 descendants = []
-                children = [i for i in all_issues if i.parent == issue_id]
-                for child in children:
+                for child in children_by_parent.get(issue_id, []):
                     descendants.append(child)
                     descendants.extend(get_all_descendants(child.id))
                 return descendants
@@ -256,22 +319,16 @@ class IssueService:
 
             return sorted(result, key=lambda i: parse_id_sort_key(i.id))
 
-        issue_by_id = {issue.id: issue for issue in all_issues}
-
         def is_tree_complete(issue_id: str) -> bool:
             """Check if an issue and all its descendants are complete."""
             issue = issue_by_id.get(issue_id)
             if not issue:
                 return False
 
-            children = [
-                i for i in all_issues if i.parent == issue_id
-            ]
-
             if issue.status != IssueStatus.DONE:
                 return False
 
-            for child in children:
+            for child in children_by_parent.get(issue_id, []):
                 if not is_tree_complete(child.id):
                     return False
 
@@ -279,8 +336,7 @@ class IssueService:
 
         def get_children_sorted(parent_id: str) -> list[Issue]:
             """Get children of a parent, sorted by ID."""
-            children = [i for i in all_issues if i.parent == parent_id]
-            return sorted(children, key=lambda i: parse_id_sort_key(i.id))
+            return children_by_parent.get(parent_id, [])
 
         # Collect all root-level issues (epics + orphan stories + orphan tasks)
         epics = [
@@ -481,7 +537,7 @@ class IssueService:
 
     def update_issue(
         self, tw_id: str, title: str | None = None, body: str | None = None
-    ) -> None:
+    ) -> Issue:
         """Update an issue's title and/or body.
 
         Args:
@@ -489,6 +545,10 @@ class IssueService:
             title: New title, or None to keep existing
             body: New body, or None to keep existing
 
+        Returns:
+            The updated issue as stored, with timestamps at the backend's
+            precision and references to unknown issues dropped
+
         Raises:
             KeyError: If the issue is not found.
         """
@@ -504,6 +564,7 @@ class IssueService:
         issue.updated_at = datetime.now(UTC)
         self._save_issue(issue)
         logger.info(f"Updated {tw_id}")
+        return self.get_issue(tw_id)
 
     def delete_issue(self, tw_id: str) -> None:
         """Delete an issue.
@@ -725,10 +786,13 @@ class IssueService:
         Returns:
             List of backlog issues with NEW status, sorted by ID
         """
+        return self._select_backlog(self.get_all_issues())
+
+    def _select_backlog(self, all_issues: list[Issue]) -> list[Issue]:
+        """Pick NEW backlog items out of already-loaded issues, sorted by ID."""
         from tw.ids import parse_id_sort_key
         from tw.models import is_backlog_type
 
-        all_issues = self.get_all_issues()
         backlog = [
             i for i in all_issues
             if is_backlog_type(i.type) and i.status == IssueStatus.NEW
@@ -745,8 +809,9 @@ class IssueService:
         """
         from tw.models import is_backlog_type
 
-        backlog_issues = self.get_backlog_issues()
-        tree = self.get_issue_tree(root_id)
+        all_issues = self.get_all_issues()
+        backlog_issues = self._select_backlog(all_issues)
+        tree = self._build_issue_tree(all_issues, root_id)
         hierarchy_tree = [
             issue for issue in tree
             if not is_backlog_type(issue.type)
@@ -34,7 +34,7 @@ from watchdog.observers import Observer
 from watchdog.observers.api import BaseObserver
 
 from tw.backend import SqliteBackend
-from tw.config import get_db_path, get_prefix
+from tw.config import get_db_path, get_prefix, get_sqlite_synchronous
 from tw.models import AnnotationType, Issue, IssueStatus, IssueType, is_backlog_type
 from tw.render import (
     build_claude_prompt,
@@ -1027,7 +1027,7 @@ class TwApp(App[None]):
 
     def __init__(self) -> None:
         super().__init__()
-        backend = SqliteBackend(get_db_path())
+        backend = SqliteBackend(get_db_path(), synchronous=get_sqlite_synchronous())
         self._service = IssueService(backend, get_prefix())
 
     def compose(self) -> ComposeResult:
@@ -1186,8 +1186,7 @@ class TwApp(App[None]):
                 content = f.read()
 
             new_title, new_body = parse_edited_content(content)
-            self._service.update_issue(issue.id, title=new_title, body=new_body)
-            updated = self._service.get_issue(issue.id)
+            updated = self._service.update_issue(issue.id, title=new_title, body=new_body)
             tree.update_issue(updated)
             self.flash(f"Updated {issue.id}")
         except (ValueError, subprocess.CalledProcessError) as e:
@@ -1,13 +1,17 @@
 """Shared pytest fixtures."""
 
 import os
+import shutil
 import tempfile
 from collections.abc import Generator
 from pathlib import Path
 
 import pytest
+from click.testing import CliRunner
 
 from tw.backend import SqliteBackend
+from tw.models import IssueType
+from tw.schema import init_db
 from tw.service import IssueService
 
 
@@ -24,29 +28,77 @@ def temp_dir() -> Generator[Path, None, None]:
         yield Path(tmpdir)
 
 
+@pytest.fixture(scope="session")
+def schema_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Build an empty, fully initialized database once per session.
+
+    Tests copy this file instead of running the schema DDL for every new
+    database.
+    """
+    db_path = tmp_path_factory.mktemp("schema") / "template.db"
+    init_db(db_path)
+    return db_path
 
 
 @pytest.fixture
-def sqlite_env(temp_dir: Path) -> Generator[dict[str, str], None, None]:
+def sqlite_env(
+    temp_dir: Path, schema_template: Path
+) -> Generator[dict[str, str], None, None]:
     """Provide isolated SQLite environment for testing.
 
     Creates a temporary database and sets required environment variables.
     """
     db_path = temp_dir / "tw.db"
+    shutil.copyfile(schema_template, db_path)
 
     env = os.environ.copy()
     env["TW_DB_PATH"] = str(db_path)
     env["TW_PREFIX"] = "TEST"
+    # Throwaway databases don't need an fsync on every commit
+    env["TW_SQLITE_SYNCHRONOUS"] = "OFF"
 
     yield env
 
 
 @pytest.fixture
-def sqlite_service(temp_dir: Path) -> IssueService:
+def cli_runner(sqlite_env: dict[str, str]) -> CliRunner:
+    """Provide a CliRunner bound to the isolated sqlite_env environment."""
+    return CliRunner(env=sqlite_env)
+
+
+@pytest.fixture
+def sqlite_service(temp_dir: Path, schema_template: Path) -> IssueService:
     """Provide an IssueService with SqliteBackend for testing.
 
     Creates a temporary SQLite database and initializes the service.
     """
     db_path = temp_dir / "test.db"
-    backend = SqliteBackend(db_path)
+    shutil.copyfile(schema_template, db_path)
+    backend = SqliteBackend(db_path, synchronous="OFF")
     return IssueService(backend, prefix="TEST")
+
+
+@pytest.fixture
+def env_service(sqlite_env: dict[str, str]) -> IssueService:
+    """Provide an IssueService on the database used by CLI runs under sqlite_env.
+
+    Lets CLI tests seed or inspect state directly instead of going through
+    extra command invocations.
+    """
+    backend = SqliteBackend(
+        sqlite_env["TW_DB_PATH"], synchronous=sqlite_env["TW_SQLITE_SYNCHRONOUS"]
+    )
+    return IssueService(backend, prefix=sqlite_env["TW_PREFIX"])
+
+
+@pytest.fixture
+def seeded_epic(env_service: IssueService) -> str:
+    """Create a NEW epic titled "Epic" in the sqlite_env database; return its ID."""
+    return env_service.create_issue(IssueType.EPIC, "Epic")
+
+
+@pytest.fixture
+def started_epic(env_service: IssueService, seeded_epic: str) -> str:
+    """Like seeded_epic, but with the epic already started."""
+    env_service.start_issue(seeded_epic)
+    return seeded_epic
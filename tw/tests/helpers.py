@@ -0,0 +1,49 @@
+"""Shared assertion helpers for the test suite."""
+
+import json
+from typing import Any
+
+from click.testing import Result
+
+
+def load_json(result: Result) -> Any:
+    """Parse a command's --json output straight from its stdout bytes.
+
+    Reading the bytes skips decoding the combined output and stripping it
+    first; json.loads ignores the trailing newline on its own. This relies
+    on CliRunner capturing stderr separately, which Click does from 8.2 (the
+    declared minimum), so warnings on stderr cannot corrupt the JSON.
+    """
+    return json.loads(result.stdout_bytes)
+
+
+def assert_all_in(output: str, *needles: str) -> None:
+    """Assert that every needle appears in output, reporting all that are missing.
+
+    Unlike a run of separate `assert ... in output` lines, which stops at the
+    first miss, the failure message lists every missing needle at once.
+
+    Args:
+        output: Text to search, typically a CLI result's output.
+        *needles: Substrings that must all be present.
+    """
+    missing = [n for n in needles if n not in output]
+    assert not missing, f"missing {missing!r} in output:\n{output}"
+
+
+def assert_subset(actual: dict[str, Any], expected: dict[str, Any]) -> None:
+    """Assert that actual contains every key of expected with an equal value.
+
+    Keys in actual that expected does not mention, such as timestamps, are
+    ignored.
+
+    Args:
+        actual: Mapping under test, typically parsed --json output.
+        expected: Keys and values that must match exactly.
+    """
+    mismatched = {
+        key: actual.get(key, "<missing>")
+        for key, value in expected.items()
+        if key not in actual or actual[key] != value
+    }
+    assert not mismatched, f"expected {expected!r}, got {mismatched!r}"
@@ -1,10 +1,117 @@
 """Tests for CLI commands."""
 
+import io
 import json
+import re
+import shutil
+import subprocess
+from pathlib import Path
 
+import click
+import pytest
 from click.testing import CliRunner
 
-from tw.cli import main
+from tests.helpers import assert_all_in, assert_subset, load_json
+from tw.cli import (
+    CaptureEntry,
+    capture_entries,
+    iter_capture_dsl,
+    main,
+    parse_capture_dsl,
+    watch,
+)
+from tw.models import AnnotationType, IssueStatus, IssueType
+from tw.service import IssueService
+
+# A complete ANSI CSI escape sequence, e.g. "\x1b[1;36m"
+_ANSI_RE = re.compile(r"\x1b\[[\d;]*[A-Za-z]")
+
+
+# Epic 1 with two stories, the first holding two tasks:
+# TEST-1, TEST-1-1, TEST-1-1a, TEST-1-1b, TEST-1-2
+_DSL_CONTEXT_TREE = """\
+- epic: Epic 1
+  - story: Story 1
+    - task: Task 1
+    - task: Task 2
+  - story: Story 2
+"""
+
+# --json view of TEST-1-1 in _DSL_CONTEXT_TREE, minus timestamps
+_EXPECTED_VIEW_1_1 = {
+    "tw_id": "TEST-1-1",
+    "tw_type": "story",
+    "title": "Story 1",
+    "tw_status": "new",
+    "tw_parent": "TEST-1",
+    "tw_body": None,
+    "tw_refs": [],
+    "annotations": [],
+}
+
+# Two epics, the first with a story and task, plus one backlog bug:
+# TEST-1, TEST-1-1, TEST-1-1a, TEST-2, TEST-3
+_DSL_SAMPLE_TREE = """\
+- epic: Epic 1
+  - story: Story 1
+    - task: Task 1
+- epic: Epic 2
+- bug: Bug One
+"""
+
+# Capture inputs for the DSL and capture command tests
+_DSL_EPIC_STORIES = """\
+- epic: user authentication
+  - story: login page
+    - task: implement form
+    - task: add validation
+  - story: password reset
+    - task: send email
+"""
+
+_DSL_WITH_COMMENTS = """\
+# This is a comment
+- epic: user auth
+# Another comment
+  - story: login
+"""
+
+_DSL_ONE_BRANCH = """\
+- epic: user authentication
+  - story: login page
+    - task: implement form
+"""
+
+_DSL_TWO_EPICS = """\
+- epic: user authentication
+  - story: login
+- epic: user profile
+  - story: avatar upload
+"""
+
+_DSL_BUG_WITH_BODY = """\
+- bug: test bug
+    This is the body.
+    With multiple lines.
+"""
+
+
+def _capture(runner: CliRunner, dsl: str) -> None:
+    """Create a whole hierarchy in one `tw capture -` invocation."""
+    result = runner.invoke(main, ["capture", "-"], input=dsl)
+    assert result.exit_code == 0, result.output
+
+
+def _call_main(monkeypatch: pytest.MonkeyPatch, env: dict[str, str], *args: str) -> int:
+    """Run the CLI in-process without CliRunner's stream isolation.
+
+    Only suitable for tests that inspect side effects rather than output.
+    Returns the exit code.
+    """
+    for key in ("TW_DB_PATH", "TW_PREFIX"):
+        monkeypatch.setenv(key, env[key])
+    rv = main.main(list(args), standalone_mode=False, obj={})
+    return 0 if rv is None else rv
 
 
 class TestCLI:
@@ -20,17 +127,13 @@ class TestCLI:
         assert result.exit_code == 0
 
     def test_no_command_shows_help_and_tree(
-        self, sqlite_env: dict[str, str]
+        self, cli_runner: CliRunner, env_service: IssueService
     ) -> None:
         """Running tw without a subcommand shows help followed by tree."""
-        runner = CliRunner(env=sqlite_env)
         # Create an issue so tree has something to show
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Test Epic"],
-        )
+        env_service.create_issue(IssueType.EPIC, "Test Epic")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             [],
         )
@@ -44,68 +147,50 @@ class TestCLI:
 
 
 class TestColorFlag:
-    def test_color_always_flag(self, sqlite_env: dict[str, str]) -> None:
-        """Test --color=always flag works and includes color codes."""
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(
-            main,
-            ["--color", "always",
-             "new", "epic", "--title", "Test Epic"],
-        )
-        assert result.exit_code == 0
-        # Should contain ANSI escape codes when color is forced
-        assert "\x1b[" in result.output
-        # Should contain the issue ID (possibly with color codes)
-        assert "TEST-" in result.output and "1" in result.output
-
-    def test_color_never_flag(self, sqlite_env: dict[str, str]) -> None:
-        """Test --color=never flag disables all color output."""
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(
-            main,
-            ["--color", "never",
-             "new", "epic", "--title", "Test Epic"],
-        )
-        assert result.exit_code == 0
-        assert "TEST-1" in result.output
-        # When color is disabled, output should not contain ANSI escape codes
-        assert "\x1b[" not in result.output
-
-    def test_color_auto_flag(self, sqlite_env: dict[str, str]) -> None:
-        """Test --color=auto flag (default behavior)."""
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(
+    @pytest.mark.parametrize(
+        ("color_args", "expect_ansi"),
+        [
+            (["--color", "always"], True),
+            (["--color", "never"], False),
+            (["--color", "auto"], None),
+            ([], None),
+        ],
+        ids=["always", "never", "auto", "default"],
+    )
+    def test_color_flag(
+        self, cli_runner: CliRunner, color_args: list[str], expect_ansi: bool | None
+    ) -> None:
+        """--color controls ANSI codes; auto (the default) depends on the terminal."""
+        result = cli_runner.invoke(
             main,
-            ["--color", "auto",
-             "new", "epic", "--title", "Test Epic"],
+            [*color_args, "new", "epic", "--title", "Test Epic"],
         )
         assert result.exit_code == 0
-        assert "TEST-1" in result.output
+        # The issue ID is present once any color codes are removed
+        assert "TEST-1" in _ANSI_RE.sub("", result.output)
+        if expect_ansi is not None:
+            assert bool(_ANSI_RE.search(result.output)) is expect_ansi
 
-    def test_color_default_is_auto(self, sqlite_env: dict[str, str]) -> None:
-        """Test that default color behavior is auto."""
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(
+    def test_color_never_with_tree(self, cli_runner: CliRunner, env_service: IssueService) -> None:
+        """Test --color=never works with tree command."""
+        env_service.create_issue(IssueType.EPIC, "Test Epic")
+        result = cli_runner.invoke(
             main,
-            ["new", "epic", "--title", "Test Epic"],
+            ["--color", "never", "tree"],
         )
         assert result.exit_code == 0
-        assert "TEST-1" in result.output
+        assert "Test Epic" in result.output
+        assert not _ANSI_RE.search(result.output)
 
-    def test_color_never_with_tree(self, sqlite_env: dict[str, str]) -> None:
-        """Test --color=never works with tree command."""
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Test Epic"],
-        )
-        result = runner.invoke(
+    def test_color_always_leaves_json_plain(self, cli_runner: CliRunner) -> None:
+        """--json output is never highlighted, even when color is forced."""
+        result = cli_runner.invoke(
             main,
-            ["--color", "never", "tree"],
+            ["--color", "always", "--json", "new", "epic", "--title", "Test Epic"],
         )
         assert result.exit_code == 0
-        assert "Test Epic" in result.output
-        assert "\x1b[" not in result.output
+        assert not _ANSI_RE.search(result.output)
+        assert load_json(result) == {"tw_id": "TEST-1"}
 
     def test_color_invalid_value(self) -> None:
         """Test that invalid color value is rejected."""
@@ -123,11 +208,12 @@ class TestOnboardCommand:
         runner = CliRunner()
         result = runner.invoke(main, ["onboard"])
         assert result.exit_code == 0
-        assert "tw" in result.output.lower()
-        assert "command" in result.output.lower()
-        assert "new" in result.output.lower()
-        assert "view" in result.output.lower()
-        assert "start" in result.output.lower()
+        output = result.output.lower()
+        assert "tw" in output
+        assert "command" in output
+        assert "new" in output
+        assert "view" in output
+        assert "start" in output
 
     def test_onboard_ignores_json_flag(self) -> None:
         runner = CliRunner()
@@ -137,124 +223,84 @@ class TestOnboardCommand:
 
 
 class TestNewCommand:
-    def test_new_epic(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(
+    def test_new_epic(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
             main,
             ["new", "epic", "--title", "User Auth"],
         )
         assert result.exit_code == 0
         assert "TEST-1" in result.output
 
-    def test_new_story_with_parent(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        # Create epic first
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
+    def test_new_story_with_parent(self, cli_runner: CliRunner, seeded_epic: str) -> None:
         # Create story
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
-            ["new", "story", "--title", "Story", "--parent", "TEST-1"],
+            ["--json", "new", "story", "--title", "Story", "--parent", "TEST-1"],
         )
         assert result.exit_code == 0
-        assert "TEST-1-1" in result.output
+        assert load_json(result) == {"tw_id": "TEST-1-1"}
 
-    def test_new_missing_title(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(
+    def test_new_missing_title(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
             main,
             ["new", "epic"],
         )
         assert result.exit_code != 0
-        assert "title" in result.output.lower() or "required" in result.output.lower()
+        output = result.output.lower()
+        assert "title" in output or "required" in output
 
-    def test_new_json_output(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(
+    def test_new_json_output(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
             main,
             ["--json",
              "new", "epic", "--title", "User Auth"],
         )
         assert result.exit_code == 0
-        output = json.loads(result.output.strip())
+        output = load_json(result)
         assert "tw_id" in output
         assert output["tw_id"] == "TEST-1"
 
-    def test_new_with_body(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(
+    def test_new_with_body(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
             main,
-            ["new", "epic", "--title", "User Auth", "--body", "Implement authentication"],
+            ["--json",
+             "new", "epic", "--title", "User Auth", "--body", "Implement authentication"],
         )
         assert result.exit_code == 0
-        assert "TEST-1" in result.output
+        assert load_json(result) == {"tw_id": "TEST-1"}
 
 
 class TestStartCommand:
-    def test_start_new_issue(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-
-        result = runner.invoke(
+    def test_start_new_issue(self, cli_runner: CliRunner, seeded_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["start", "TEST-1"],
         )
         assert result.exit_code == 0
         assert "TEST-1" in result.output
 
-    def test_start_json_output(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-
-        result = runner.invoke(
+    def test_start_json_output(self, cli_runner: CliRunner, seeded_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["--json", "start", "TEST-1"],
         )
         assert result.exit_code == 0
-        output = json.loads(result.output.strip())
+        output = load_json(result)
         assert output["tw_id"] == "TEST-1"
         assert output["status"] == "started"
 
 
 class TestDoneCommand:
-    def test_done_in_progress_issue(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-        runner.invoke(
-            main,
-            ["start", "TEST-1"],
-        )
-
-        result = runner.invoke(
+    def test_done_in_progress_issue(self, cli_runner: CliRunner, started_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["done", "TEST-1"],
         )
         assert result.exit_code == 0
         assert "TEST-1" in result.output
 
-    def test_done_with_message(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-        runner.invoke(
-            main,
-            ["start", "TEST-1"],
-        )
-
-        result = runner.invoke(
+    def test_done_with_message(self, cli_runner: CliRunner, started_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["done", "TEST-1", "--message", "Completed successfully"],
         )
@@ -262,36 +308,16 @@ class TestDoneCommand:
 
 
 class TestBlockCommand:
-    def test_block_in_progress_issue(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-        runner.invoke(
-            main,
-            ["start", "TEST-1"],
-        )
-
-        result = runner.invoke(
+    def test_block_in_progress_issue(self, cli_runner: CliRunner, started_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["blocked", "TEST-1", "--reason", "Waiting for API"],
         )
         assert result.exit_code == 0
         assert "TEST-1" in result.output
 
-    def test_block_missing_reason(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-        runner.invoke(
-            main,
-            ["start", "TEST-1"],
-        )
-
-        result = runner.invoke(
+    def test_block_missing_reason(self, cli_runner: CliRunner, started_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["blocked", "TEST-1"],
         )
@@ -299,44 +325,24 @@ class TestBlockCommand:
 
 
 class TestUnblockCommand:
-    def test_unblock_blocked_issue(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-        runner.invoke(
-            main,
-            ["start", "TEST-1"],
-        )
-        runner.invoke(
-            main,
-            ["blocked", "TEST-1", "--reason", "Waiting"],
-        )
+    def test_unblock_blocked_issue(
+        self, cli_runner: CliRunner, env_service: IssueService, started_epic: str
+    ) -> None:
+        env_service.block_issue(started_epic, "Waiting")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["unblock", "TEST-1", "--message", "API available"],
         )
         assert result.exit_code == 0
         assert "TEST-1" in result.output
 
-    def test_unblock_allows_default_message(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-        runner.invoke(
-            main,
-            ["start", "TEST-1"],
-        )
-        runner.invoke(
-            main,
-            ["blocked", "TEST-1", "--reason", "Waiting"],
-        )
+    def test_unblock_allows_default_message(
+        self, cli_runner: CliRunner, env_service: IssueService, started_epic: str
+    ) -> None:
+        env_service.block_issue(started_epic, "Waiting")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["unblock", "TEST-1"],
         )
@@ -344,18 +350,8 @@ class TestUnblockCommand:
 
 
 class TestHandoffCommand:
-    def test_handoff_in_progress_issue(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-        runner.invoke(
-            main,
-            ["start", "TEST-1"],
-        )
-
-        result = runner.invoke(
+    def test_handoff_in_progress_issue(self, cli_runner: CliRunner, started_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["handoff", "TEST-1",
              "--status", "Working on auth",
@@ -365,18 +361,10 @@ class TestHandoffCommand:
         assert result.exit_code == 0
         assert "TEST-1" in result.output
 
-    def test_handoff_missing_required_fields(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-        runner.invoke(
-            main,
-            ["start", "TEST-1"],
-        )
-
-        result = runner.invoke(
+    def test_handoff_missing_required_fields(
+        self, cli_runner: CliRunner, started_epic: str
+    ) -> None:
+        result = cli_runner.invoke(
             main,
             ["handoff", "TEST-1"],
         )
@@ -384,55 +372,36 @@ class TestHandoffCommand:
 
 
 class TestCommentCommand:
-    def test_comment_adds_annotation(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-
-        result = runner.invoke(
+    def test_comment_adds_annotation(self, cli_runner: CliRunner, seeded_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["comment", "TEST-1", "--message", "This is a comment"],
         )
         assert result.exit_code == 0
         assert "TEST-1" in result.output
 
-    def test_comment_missing_message(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-
-        result = runner.invoke(
+    def test_comment_missing_message(self, cli_runner: CliRunner, seeded_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["comment", "TEST-1"],
         )
         assert result.exit_code != 0
-        assert "message" in result.output.lower() or "required" in result.output.lower()
-
-    def test_comment_json_output(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
+        output = result.output.lower()
+        assert "message" in output or "required" in output
 
-        result = runner.invoke(
+    def test_comment_json_output(self, cli_runner: CliRunner, seeded_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["--json",
              "comment", "TEST-1", "--message", "Test comment"],
         )
         assert result.exit_code == 0
-        output = json.loads(result.output.strip())
+        output = load_json(result)
         assert output["tw_id"] == "TEST-1"
         assert "comment" in output["action"] or "commented" in output["action"]
 
-    def test_comment_nonexistent_issue(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        result = runner.invoke(
+    def test_comment_nonexistent_issue(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
             main,
             ["comment", "TEST-999", "--message", "Comment"],
         )
@@ -440,86 +409,58 @@ class TestCommentCommand:
 
 
 class TestDeleteCommand:
-    def test_delete_issue_without_children(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-
-        result = runner.invoke(
+    def test_delete_issue_without_children(self, cli_runner: CliRunner, seeded_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["delete", "TEST-1"],
         )
         assert result.exit_code == 0
         assert "TEST-1" in result.output
 
-    def test_delete_issue_with_children_fails(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Story", "--parent", "TEST-1"],
-        )
+    def test_delete_issue_with_children_fails(
+        self, cli_runner: CliRunner, env_service: IssueService, seeded_epic: str
+    ) -> None:
+        env_service.create_issue(IssueType.STORY, "Story", parent_id="TEST-1")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["delete", "TEST-1"],
         )
         assert result.exit_code != 0
         assert "children" in result.output.lower()
 
-    def test_delete_nonexistent_issue(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        result = runner.invoke(
+    def test_delete_nonexistent_issue(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
             main,
             ["delete", "TEST-999"],
         )
         assert result.exit_code != 0
 
-    def test_delete_json_output(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-
-        result = runner.invoke(
+    def test_delete_json_output(self, cli_runner: CliRunner, seeded_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["--json", "delete", "TEST-1"],
         )
         assert result.exit_code == 0
-        output = json.loads(result.output.strip())
+        output = load_json(result)
         assert output["tw_id"] == "TEST-1"
         assert output["status"] == "deleted"
 
     def test_delete_parent_after_child_deleted(
-        self, sqlite_env: dict[str, str]
+        self, cli_runner: CliRunner, env_service: IssueService, seeded_epic: str
     ) -> None:
         """Deleting a parent should succeed after its children are deleted."""
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Story", "--parent", "TEST-1"],
-        )
+        env_service.create_issue(IssueType.STORY, "Story", parent_id="TEST-1")
 
         # Delete child first
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["delete", "TEST-1-1"],
         )
         assert result.exit_code == 0
 
         # Now parent deletion should succeed
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["delete", "TEST-1"],
         )
@@ -528,73 +469,43 @@ class TestDeleteCommand:
 
 
 class TestRecordCommand:
-    def test_record_lesson(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-
-        result = runner.invoke(
+    def test_record_lesson(self, cli_runner: CliRunner, seeded_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["record", "TEST-1", "lesson", "--message", "Always validate input"],
         )
         assert result.exit_code == 0
         assert "TEST-1" in result.output
 
-    def test_record_deviation(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
+    def test_record_deviation(self, cli_runner: CliRunner, seeded_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
-            ["new", "epic", "--title", "Epic"],
-        )
-
-        result = runner.invoke(
-            main,
-            ["record", "TEST-1", "deviation", "--message", "Changed database schema"],
+            ["--json", "record", "TEST-1", "deviation", "--message", "Changed database schema"],
         )
         assert result.exit_code == 0
-        assert "TEST-1" in result.output
+        assert load_json(result) == {"tw_id": "TEST-1", "annotation_type": "deviation"}
 
-    def test_record_commit(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-
-        result = runner.invoke(
+    def test_record_commit(self, cli_runner: CliRunner, seeded_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
-            ["record", "TEST-1", "commit", "--message", "abc123 - Add feature"],
+            ["--json", "record", "TEST-1", "commit", "--message", "abc123 - Add feature"],
         )
         assert result.exit_code == 0
-        assert "TEST-1" in result.output
+        assert load_json(result) == {"tw_id": "TEST-1", "annotation_type": "commit"}
 
-    def test_record_json_output(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-
-        result = runner.invoke(
+    def test_record_json_output(self, cli_runner: CliRunner, seeded_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["--json",
              "record", "TEST-1", "lesson", "--message", "Test lesson"],
         )
         assert result.exit_code == 0
-        output = json.loads(result.output.strip())
+        output = load_json(result)
         assert output["tw_id"] == "TEST-1"
         assert output["annotation_type"] == "lesson"
 
-    def test_record_missing_message(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-
-        result = runner.invoke(
+    def test_record_missing_message(self, cli_runner: CliRunner, seeded_epic: str) -> None:
+        result = cli_runner.invoke(
             main,
             ["record", "TEST-1", "lesson"],
         )
@@ -602,93 +513,68 @@ class TestRecordCommand:
 
 
 class TestDigestCommand:
-    def test_digest_parent_with_children(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "User Auth"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Login form", "--parent", "TEST-1"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Password reset", "--parent", "TEST-1"],
-        )
+    def test_digest_parent_with_children(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        env_service.create_issue(IssueType.EPIC, "User Auth")
+        env_service.create_issue(IssueType.STORY, "Login form", parent_id="TEST-1")
+        env_service.create_issue(IssueType.STORY, "Password reset", parent_id="TEST-1")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["digest", "TEST-1"],
         )
         assert result.exit_code == 0
-        assert "TEST-1" in result.output
-        assert "User Auth" in result.output
-        assert "TEST-1-1" in result.output
-        assert "Login form" in result.output
-        assert "TEST-1-2" in result.output
-        assert "Password reset" in result.output
-
-    def test_digest_with_lessons_and_deviations(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "User Auth"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Login", "--parent", "TEST-1"],
-        )
-        runner.invoke(
-            main,
-            ["record", "TEST-1-1", "lesson", "--message", "Always validate input"],
+        assert_all_in(
+            result.output,
+            "TEST-1",
+            "User Auth",
+            "TEST-1-1",
+            "Login form",
+            "TEST-1-2",
+            "Password reset",
+        )
+
+    def test_digest_with_lessons_and_deviations(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        env_service.create_issue(IssueType.EPIC, "User Auth")
+        env_service.create_issue(IssueType.STORY, "Login", parent_id="TEST-1")
+        env_service.record_annotation(
+            "TEST-1-1", AnnotationType.LESSON, "Always validate input"
         )
-        runner.invoke(
-            main,
-            ["record", "TEST-1-1", "deviation", "--message", "Changed database schema"],
+        env_service.record_annotation(
+            "TEST-1-1", AnnotationType.DEVIATION, "Changed database schema"
         )
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["digest", "TEST-1"],
         )
         assert result.exit_code == 0
-        assert "lesson" in result.output.lower() or "Lessons" in result.output
-        assert "Always validate input" in result.output
-        assert "deviation" in result.output.lower() or "Deviations" in result.output
-        assert "Changed database schema" in result.output
-
-    def test_digest_json_output(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "User Auth"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Login", "--parent", "TEST-1"],
-        )
+        assert_all_in(result.output.lower(), "lesson", "deviation")
+        assert_all_in(result.output, "Always validate input", "Changed database schema")
 
-        result = runner.invoke(
+    def test_digest_json_output(self, cli_runner: CliRunner, env_service: IssueService) -> None:
+        env_service.create_issue(IssueType.EPIC, "User Auth")
+        env_service.create_issue(IssueType.STORY, "Login", parent_id="TEST-1")
+
+        result = cli_runner.invoke(
             main,
             ["--json", "digest", "TEST-1"],
         )
         assert result.exit_code == 0
-        output = json.loads(result.output.strip())
+        output = load_json(result)
         assert "parent" in output
         assert output["parent"]["tw_id"] == "TEST-1"
         assert "children" in output
         assert len(output["children"]) == 1
         assert output["children"][0]["tw_id"] == "TEST-1-1"
 
-    def test_digest_no_children(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "User Auth"],
-        )
+    def test_digest_no_children(self, cli_runner: CliRunner, env_service: IssueService) -> None:
+        env_service.create_issue(IssueType.EPIC, "User Auth")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["digest", "TEST-1"],
         )
@@ -696,25 +582,52 @@ class TestDigestCommand:
         assert "TEST-1" in result.output
         assert "User Auth" in result.output
 
-    def test_digest_nonexistent_issue(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        result = runner.invoke(
+    def test_digest_nonexistent_issue(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
             main,
             ["digest", "TEST-999"],
         )
         assert result.exit_code != 0
 
 
+def _seeded_runner(
+    tmp_path_factory: pytest.TempPathFactory, schema_template: Path, dsl: str
+) -> CliRunner:
+    """Build a runner on a fresh database populated from a capture DSL."""
+    db_path = tmp_path_factory.mktemp("seeded") / "tw.db"
+    shutil.copyfile(schema_template, db_path)
+    runner = CliRunner(env={"TW_DB_PATH": str(db_path), "TW_PREFIX": "TEST"})
+    _capture(runner, dsl)
+    return runner
+
+
+@pytest.fixture(scope="class")
+def context_tree_runner(
+    tmp_path_factory: pytest.TempPathFactory, schema_template: Path
+) -> CliRunner:
+    """A runner on a database holding _DSL_CONTEXT_TREE, shared by a test class.
+
+    Only for tests that do not modify the database.
+    """
+    return _seeded_runner(tmp_path_factory, schema_template, _DSL_CONTEXT_TREE)
+
+
+@pytest.fixture(scope="class")
+def sample_tree_runner(
+    tmp_path_factory: pytest.TempPathFactory, schema_template: Path
+) -> CliRunner:
+    """A runner on a database holding _DSL_SAMPLE_TREE, shared by a test class.
+
+    Only for tests that do not modify the database.
+    """
+    return _seeded_runner(tmp_path_factory, schema_template, _DSL_SAMPLE_TREE)
+
+
 class TestViewCommand:
-    def test_view_basic_issue(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "User Auth", "--body", "Implement authentication"],
-        )
+    def test_view_basic_issue(self, cli_runner: CliRunner, env_service: IssueService) -> None:
+        env_service.create_issue(IssueType.EPIC, "User Auth", body="Implement authentication")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["view", "TEST-1"],
         )
@@ -724,18 +637,12 @@ class TestViewCommand:
         assert "Implement authentication" in result.output
         assert "epic" in result.output
 
-    def test_view_issue_with_annotations(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-        runner.invoke(
-            main,
-            ["comment", "TEST-1", "-m", "Test comment"],
-        )
+    def test_view_issue_with_annotations(
+        self, cli_runner: CliRunner, env_service: IssueService, seeded_epic: str
+    ) -> None:
+        env_service.record_annotation(seeded_epic, AnnotationType.COMMENT, "Test comment")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["view", "TEST-1"],
         )
@@ -744,25 +651,17 @@ class TestViewCommand:
         assert "comment:" in result.output
         assert "Test comment" in result.output
 
-    def test_view_stopped_issue_with_handoff(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic"],
-        )
-        runner.invoke(
-            main,
-            ["start", "TEST-1"],
-        )
-        runner.invoke(
-            main,
-            ["handoff", "TEST-1",
-             "--status", "Working on auth",
-             "--completed", "Login form",
-             "--remaining", "Password reset"],
+    def test_view_stopped_issue_with_handoff(
+        self, cli_runner: CliRunner, env_service: IssueService, started_epic: str
+    ) -> None:
+        env_service.handoff_issue(
+            started_epic,
+            status="Working on auth",
+            completed="Login form",
+            remaining="Password reset",
         )
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["view", "TEST-1"],
         )
@@ -771,202 +670,111 @@ class TestViewCommand:
         assert "HANDOFF" in result.output
         assert "Working on auth" in result.output
 
-    def test_view_json_output(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "User Auth"],
-        )
+    def test_view_json_output(self, cli_runner: CliRunner, env_service: IssueService) -> None:
+        env_service.create_issue(IssueType.EPIC, "User Auth")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["--json", "view", "TEST-1"],
         )
         assert result.exit_code == 0
-        output = json.loads(result.output.strip())
-        assert output["tw_id"] == "TEST-1"
-        assert output["title"] == "User Auth"
-        assert output["tw_type"] == "epic"
-        assert "ancestors" not in output
-        assert "siblings" not in output
-        assert "descendants" not in output
+        output = load_json(result)
+        assert_subset(output, {"tw_id": "TEST-1", "title": "User Auth", "tw_type": "epic"})
+        assert output.keys().isdisjoint({"ancestors", "siblings", "descendants"})
 
-    def test_view_nonexistent_issue(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        result = runner.invoke(
+    def test_view_nonexistent_issue(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
             main,
             ["view", "TEST-999"],
         )
         assert result.exit_code != 0
         assert "error" in result.output.lower()
 
-    def test_view_shows_full_context(self, sqlite_env: dict[str, str]) -> None:
+    def test_view_shows_full_context(self, context_tree_runner: CliRunner) -> None:
         """Test that view shows ancestors, siblings, and descendants."""
-        runner = CliRunner(env=sqlite_env)
-
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic 1"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Story 1", "--parent", "TEST-1"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Story 2", "--parent", "TEST-1"],
-        )
-        runner.invoke(
-            main,
-            ["new", "task", "--title", "Task 1", "--parent", "TEST-1-1"],
-        )
-        runner.invoke(
-            main,
-            ["new", "task", "--title", "Task 2", "--parent", "TEST-1-1"],
-        )
-
-        result = runner.invoke(
+        result = context_tree_runner.invoke(
             main,
             ["view", "TEST-1-1"],
         )
         assert result.exit_code == 0
-        assert "TEST-1-1" in result.output
-        assert "Story 1" in result.output
-
-        assert "parent:" in result.output
-        assert "TEST-1" in result.output
-        assert "Epic 1" in result.output
-
-        assert "sibling:" in result.output
-        assert "TEST-1-2" in result.output
-        assert "Story 2" in result.output
-
-        assert "child:" in result.output
-        assert "TEST-1-1a" in result.output
-        assert "Task 1" in result.output
-        assert "TEST-1-1b" in result.output
-        assert "Task 2" in result.output
-
-    def test_view_full_context_json(self, sqlite_env: dict[str, str]) -> None:
+        assert_all_in(
+            result.output,
+            "TEST-1-1",
+            "Story 1",
+            "parent:",
+            "TEST-1",
+            "Epic 1",
+            "sibling:",
+            "TEST-1-2",
+            "Story 2",
+            "child:",
+            "TEST-1-1a",
+            "Task 1",
+            "TEST-1-1b",
+            "Task 2",
+        )
+
+    def test_view_full_context_json(self, context_tree_runner: CliRunner) -> None:
         """Test JSON output does NOT include full context."""
-        runner = CliRunner(env=sqlite_env)
-
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic 1"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Story 1", "--parent", "TEST-1"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Story 2", "--parent", "TEST-1"],
-        )
-        runner.invoke(
-            main,
-            ["new", "task", "--title", "Task 1", "--parent", "TEST-1-1"],
-        )
-
-        result = runner.invoke(
+        result = context_tree_runner.invoke(
             main,
             ["--json", "view", "TEST-1-1"],
         )
         assert result.exit_code == 0
-        output = json.loads(result.output.strip())
-
-        assert output["tw_id"] == "TEST-1-1"
-        assert output["title"] == "Story 1"
-        assert output["tw_parent"] == "TEST-1"
+        output = load_json(result)
 
-        assert "ancestors" not in output
-        assert "siblings" not in output
-        assert "descendants" not in output
+        assert_subset(output, _EXPECTED_VIEW_1_1)
+        assert output.keys().isdisjoint({"ancestors", "siblings", "descendants"})
 
 
 class TestTreeCommand:
-    def test_tree_empty_project(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(
+    def test_tree_empty_project(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
             main,
             ["tree"],
         )
         assert result.exit_code == 0
 
-    def test_tree_shows_hierarchy(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "User Auth"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Login Form", "--parent", "TEST-1"],
-        )
-        runner.invoke(
-            main,
-            ["new", "task", "--title", "Create UI", "--parent", "TEST-1-1"],
-        )
-
-        result = runner.invoke(
+    def test_tree_shows_hierarchy(self, sample_tree_runner: CliRunner) -> None:
+        result = sample_tree_runner.invoke(
             main,
             ["tree"],
         )
         assert result.exit_code == 0
-        assert "User Auth" in result.output
-        assert "Login Form" in result.output
-        assert "Create UI" in result.output
-        assert "TEST-1" in result.output
-        assert "TEST-1-1" in result.output
-        assert "TEST-1-1a" in result.output
-
-    def test_tree_filters_completed_epics(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Complete Epic"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Complete Story", "--parent", "TEST-1"],
-        )
-        runner.invoke(
-            main,
-            ["start", "TEST-1-1"],
-        )
-        runner.invoke(
-            main,
-            ["done", "TEST-1-1"],
-        )
-        runner.invoke(
-            main,
-            ["start", "TEST-1"],
-        )
-        runner.invoke(
-            main,
-            ["done", "TEST-1"],
-        )
+        assert_all_in(
+            result.output,
+            "Epic 1",
+            "Story 1",
+            "Task 1",
+            "TEST-1",
+            "TEST-1-1",
+            "TEST-1-1a",
+        )
+
+    def test_tree_filters_completed_epics(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        env_service.create_issue(IssueType.EPIC, "Complete Epic")
+        env_service.create_issue(IssueType.STORY, "Complete Story", parent_id="TEST-1")
+        env_service.start_issue("TEST-1-1")
+        env_service.done_issue("TEST-1-1")
+        env_service.start_issue("TEST-1")
+        env_service.done_issue("TEST-1")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["tree"],
         )
         assert result.exit_code == 0
         assert "Complete Epic" not in result.output
 
-    def test_tree_shows_incomplete_epics(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Incomplete Epic"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Incomplete Story", "--parent", "TEST-1"],
-        )
+    def test_tree_shows_incomplete_epics(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        env_service.create_issue(IssueType.EPIC, "Incomplete Epic")
+        env_service.create_issue(IssueType.STORY, "Incomplete Story", parent_id="TEST-1")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["tree"],
         )
@@ -974,158 +782,127 @@ class TestTreeCommand:
         assert "Incomplete Epic" in result.output
         assert "Incomplete Story" in result.output
 
-    def test_tree_json_output(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "User Auth"],
-        )
-
-        result = runner.invoke(
+    def test_tree_json_output(self, sample_tree_runner: CliRunner) -> None:
+        result = sample_tree_runner.invoke(
             main,
             ["--json", "tree"],
         )
         assert result.exit_code == 0
-        output = json.loads(result.output.strip())
+        output = load_json(result)
         assert isinstance(output, dict)
         assert "hierarchy" in output
         assert "backlog" in output
         assert len(output["hierarchy"]) > 0
         assert output["hierarchy"][0]["tw_id"] == "TEST-1"
-        assert output["hierarchy"][0]["title"] == "User Auth"
+        assert output["hierarchy"][0]["title"] == "Epic 1"
 
-    def test_tree_with_root_id(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic 1"],
-        )
-        runner.invoke(
-            main,
-            ["new", "story", "--title", "Story 1", "--parent", "TEST-1"],
-        )
-        runner.invoke(
-            main,
-            ["new", "task", "--title", "Task 1", "--parent", "TEST-1-1"],
-        )
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic 2"],
-        )
-
-        result = runner.invoke(
+    def test_tree_with_root_id(self, sample_tree_runner: CliRunner) -> None:
+        result = sample_tree_runner.invoke(
             main,
             ["tree", "TEST-1"],
         )
         assert result.exit_code == 0
-        assert "Epic 1" in result.output
-        assert "Story 1" in result.output
-        assert "Task 1" in result.output
+        assert_all_in(result.output, "Epic 1", "Story 1", "Task 1")
         assert "Epic 2" not in result.output
 
-    def test_tree_with_invalid_root_id(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(
+    def test_tree_with_invalid_root_id(self, sample_tree_runner: CliRunner) -> None:
+        result = sample_tree_runner.invoke(
             main,
             ["tree", "TEST-999"],
         )
         assert result.exit_code == 1
         assert "not found" in result.output.lower()
 
-    def test_tree_shows_backlog_section(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Epic One"],
-        )
-        runner.invoke(
-            main,
-            ["new", "bug", "--title", "Bug One"],
-        )
-
-        result = runner.invoke(
+    def test_tree_shows_backlog_section(self, sample_tree_runner: CliRunner) -> None:
+        result = sample_tree_runner.invoke(
             main,
             ["tree"],
         )
 
         assert result.exit_code == 0
-        assert "Epic One" in result.output
-        assert "Backlog" in result.output
-        assert "Bug One" in result.output
+        assert_all_in(result.output, "Epic 1", "Backlog", "Bug One")
 
 
 class TestParseCapturesDsl:
-    def test_parse_multiline_body(self) -> None:
-        """Parse entries with multi-line body content."""
-        from tw.cli import parse_capture_dsl
-
-        content = """- bug: login broken
+    @pytest.mark.parametrize(
+        ("content", "expected"),
+        [
+            pytest.param(
+                """\
+- bug: login broken
     The login form crashes.
     Discovered while working on TEST-5.
 - idea: password meter
     Would improve UX.
-"""
-        entries = parse_capture_dsl(content)
-
-        assert len(entries) == 2
-        assert entries[0].issue_type == "bug"
-        assert entries[0].title == "login broken"
-        assert entries[0].body == "The login form crashes.\nDiscovered while working on TEST-5."
-        assert entries[1].issue_type == "idea"
-        assert entries[1].title == "password meter"
-        assert entries[1].body == "Would improve UX."
-
-    def test_parse_multiline_with_separator(self) -> None:
-        """Parse entries with --- separator in body."""
-        from tw.cli import parse_capture_dsl
-
-        content = """- task: implement form
+""",
+                [
+                    CaptureEntry(
+                        "bug",
+                        "login broken",
+                        None,
+                        "The login form crashes.\nDiscovered while working on TEST-5.",
+                    ),
+                    CaptureEntry("idea", "password meter", None, "Would improve UX."),
+                ],
+                id="multiline-body",
+            ),
+            pytest.param(
+                """\
+- task: implement form
     Repeatable summary here.
     ---
     Non-repeatable details.
-"""
-        entries = parse_capture_dsl(content)
-
-        assert len(entries) == 1
-        assert entries[0].body == "Repeatable summary here.\n---\nNon-repeatable details."
-
-    def test_parse_preserves_hierarchy_with_multiline(self) -> None:
-        """Multi-line bodies work with hierarchy."""
-        from tw.cli import parse_capture_dsl
-
-        content = """- epic: auth system
+""",
+                [
+                    CaptureEntry(
+                        "task",
+                        "implement form",
+                        None,
+                        "Repeatable summary here.\n---\nNon-repeatable details.",
+                    ),
+                ],
+                id="multiline-with-separator",
+            ),
+            pytest.param(
+                """\
+- epic: auth system
     High level description.
   - story: login
       Story details here.
     - task: form
         Task details.
-"""
-        entries = parse_capture_dsl(content)
-
-        assert len(entries) == 3
-        assert entries[0].parent_title is None
-        assert entries[0].body == "High level description."
-        assert entries[1].parent_title == "auth system"
-        assert entries[1].body == "Story details here."
-        assert entries[2].parent_title == "login"
-        assert entries[2].body == "Task details."
+""",
+                [
+                    CaptureEntry("epic", "auth system", None, "High level description."),
+                    CaptureEntry("story", "login", "auth system", "Story details here."),
+                    CaptureEntry("task", "form", "login", "Task details."),
+                ],
+                id="hierarchy-with-multiline",
+            ),
+        ],
+    )
+    def test_parse(self, content: str, expected: list[CaptureEntry]) -> None:
+        """Bodies are dedented and joined; parents follow indentation."""
+        assert parse_capture_dsl(content) == expected
+
+    def test_iter_accepts_newline_terminated_lines(self) -> None:
+        """Lines read from a stream keep their newlines; bodies must not."""
+        stream = io.StringIO("- epic: auth\r\n    Details.\r\n  - story: login\n")
+        entries = iter_capture_dsl(stream)
+
+        first = next(entries)
+        assert first.title == "auth"
+        assert first.body == "Details."
+        assert next(entries).parent_title == "auth"
+        assert next(entries, None) is None
 
 
 class TestCaptureCommand:
-    def test_capture_from_stdin(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        dsl_input = """- epic: user authentication
-  - story: login page
-    - task: implement form
-    - task: add validation
-  - story: password reset
-    - task: send email
-"""
-        result = runner.invoke(
+    def test_capture_from_stdin(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
             main,
             ["capture", "-"],
-            input=dsl_input,
+            input=_DSL_EPIC_STORIES,
         )
         assert result.exit_code == 0
         assert "TEST-1" in result.output
@@ -1135,98 +912,134 @@ class TestCaptureCommand:
         assert "TEST-1-2" in result.output
         assert "TEST-1-2a" in result.output
 
-    def test_capture_ignores_comments(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        dsl_input = """# This is a comment
-- epic: user auth
-# Another comment
-  - story: login
-"""
-        result = runner.invoke(
-            main,
-            ["capture", "-"],
-            input=dsl_input,
-        )
-        assert result.exit_code == 0
-        assert "TEST-1" in result.output
-        assert "TEST-1-1" in result.output
-
-    def test_capture_json_output(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        dsl_input = """- epic: user authentication
-  - story: login page
-    - task: implement form
-"""
-        result = runner.invoke(
+    def test_capture_json_output(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
             main,
             ["--json", "capture", "-"],
-            input=dsl_input,
+            input=_DSL_ONE_BRANCH,
         )
         assert result.exit_code == 0
-        output = json.loads(result.output.strip())
+        output = load_json(result)
         assert "created" in output
         assert len(output["created"]) == 3
         assert output["created"][0]["tw_id"] == "TEST-1"
         assert output["created"][1]["tw_id"] == "TEST-1-1"
         assert output["created"][2]["tw_id"] == "TEST-1-1a"
 
-    def test_capture_empty_input(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(
+    def test_capture_empty_input(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
             main,
             ["capture", "-"],
             input="",
         )
         assert result.exit_code == 0
 
-    def test_capture_only_comments(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(
+
+class TestCaptureEntries:
+    """capture_entries and parse_capture_dsl without the CLI plumbing."""
+
+    def test_ignores_comments(self, sqlite_service: IssueService) -> None:
+        tw_ids = capture_entries(sqlite_service, parse_capture_dsl(_DSL_WITH_COMMENTS))
+
+        assert tw_ids == ["TEST-1", "TEST-1-1"]
+        assert sqlite_service.get_issue("TEST-1-1").parent == "TEST-1"
+
+    def test_only_comments_creates_nothing(self, sqlite_service: IssueService) -> None:
+        entries = parse_capture_dsl("# just a comment\n# another comment\n")
+
+        assert entries == []
+        assert capture_entries(sqlite_service, entries) == []
+
+    def test_multiple_epics(self, sqlite_service: IssueService) -> None:
+        tw_ids = capture_entries(sqlite_service, parse_capture_dsl(_DSL_TWO_EPICS))
+
+        assert tw_ids == ["TEST-1", "TEST-1-1", "TEST-2", "TEST-2-1"]
+        assert sqlite_service.get_issue("TEST-2-1").title == "avatar upload"
+
+    def test_stores_body(self, sqlite_service: IssueService) -> None:
+        capture_entries(sqlite_service, parse_capture_dsl(_DSL_BUG_WITH_BODY))
+
+        issue = sqlite_service.get_issue("TEST-1")
+        assert issue.body == "This is the body.\nWith multiple lines."
+
+
+class TestBatchCommand:
+    def test_batch_runs_commands_in_order(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        result = cli_runner.invoke(
             main,
-            ["capture", "-"],
-            input="# just a comment\n# another comment\n",
+            ["batch"],
+            input=(
+                "# set up an epic\n"
+                "new epic --title 'User Auth'\n"
+                "\n"
+                'new story --title "Login form" --parent TEST-1\n'
+                "start TEST-1-1\n"
+            ),
         )
-        assert result.exit_code == 0
 
-    def test_capture_multiple_epics(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        dsl_input = """- epic: user authentication
-  - story: login
-- epic: user profile
-  - story: avatar upload
-"""
-        result = runner.invoke(
+        assert result.exit_code == 0, result.output
+        assert_all_in(result.output, "Created epic TEST-1", "Created story TEST-1-1")
+        assert env_service.get_issue("TEST-1-1").status == IssueStatus.IN_PROGRESS
+
+    def test_batch_stops_at_first_failure(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        result = cli_runner.invoke(
             main,
-            ["capture", "-"],
-            input=dsl_input,
+            ["batch"],
+            input="new epic --title First\nstart TEST-9\nnew epic --title Second\n",
         )
-        assert result.exit_code == 0
-        assert "TEST-1" in result.output
-        assert "TEST-1-1" in result.output
-        assert "TEST-2" in result.output
-        assert "TEST-2-1" in result.output
 
-    def test_capture_with_body(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
+        assert result.exit_code == 1
+        assert "error: line 2: start TEST-9" in result.stderr
+        assert [issue.title for issue in env_service.get_all_issues()] == ["First"]
+
+    @pytest.mark.parametrize(
+        ("line", "message"),
+        [
+            ("bogus TEST-1", "No such command 'bogus'"),
+            ("new epic", "Missing option '--title'"),
+            ("new epic --title 'unterminated", "No closing quotation"),
+            ("batch", "cannot run 'batch' in a batch"),
+            ("capture -", "cannot read stdin in a batch: capture -"),
+            ("edit TEST-1 --body -", "cannot read stdin in a batch: edit TEST-1 --body -"),
+        ],
+    )
+    def test_batch_reports_bad_lines(
+        self, cli_runner: CliRunner, line: str, message: str
+    ) -> None:
+        result = cli_runner.invoke(main, ["batch"], input=f"{line}\n")
 
-        result = runner.invoke(main, ["capture", "-"], input="""- bug: test bug
-    This is the body.
-    With multiple lines.
-""")
+        assert result.exit_code != 0
+        assert f"error: line 1: {message}" in result.stderr
 
-        assert result.exit_code == 0
+    def test_batch_stdin_line_leaves_script_unread(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        result = cli_runner.invoke(
+            main, ["batch"], input="new epic --title First --body -\nnew epic --title Second\n"
+        )
 
-        # Verify body was stored
-        result = runner.invoke(main, ["--json", "view", "TEST-1"])
-        data = json.loads(result.output.strip())
-        assert data["tw_body"] == "This is the body.\nWith multiple lines."
+        assert result.exit_code == 2
+        assert env_service.get_all_issues() == []
 
+    def test_batch_shares_global_json_flag(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
+            main,
+            ["--json", "batch"],
+            input="new epic --title One\nnew epic --title Two\n",
+        )
+
+        assert result.exit_code == 0
+        lines = result.stdout.splitlines()
+        assert [json.loads(line) for line in lines] == [{"tw_id": "TEST-1"}, {"tw_id": "TEST-2"}]
 
-class TestNewBacklogCommands:
-    def test_new_bug(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
 
-        result = runner.invoke(main, ["new", "bug",
+class TestNewBacklogCommands:
+    def test_new_bug(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(main, ["new", "bug",
             "--title", "Login broken",
             "--body", "Crashes on empty password"
         ])
@@ -1234,22 +1047,16 @@ class TestNewBacklogCommands:
         assert result.exit_code == 0
         assert "DEFAULT-1" in result.output or "TEST-1" in result.output
 
-    def test_new_idea(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        result = runner.invoke(main, ["new", "idea",
+    def test_new_idea(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(main, ["new", "idea",
             "--title", "Password strength meter"
         ])
 
         assert result.exit_code == 0
         assert "DEFAULT-1" in result.output or "TEST-1" in result.output
 
-    def test_new_bug_rejects_parent(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        runner.invoke(main, ["new", "epic", "--title", "Epic"
-        ])
-        result = runner.invoke(main, ["new", "bug",
+    def test_new_bug_rejects_parent(self, cli_runner: CliRunner, seeded_epic: str) -> None:
+        result = cli_runner.invoke(main, ["new", "bug",
             "--title", "Bug",
             "--parent", "TEST-1"
         ])
@@ -1259,83 +1066,65 @@ class TestNewBacklogCommands:
 
 
 class TestGroomCommand:
-    def test_groom_empty_backlog(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        result = runner.invoke(main, ["groom"
+    def test_groom_empty_backlog(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(main, ["groom"
         ])
 
         assert result.exit_code == 0
         assert "No backlog items" in result.output
 
     def test_groom_resolves_removed(
-        self, sqlite_env: dict[str, str], monkeypatch
+        self, cli_runner: CliRunner, env_service: IssueService, monkeypatch
     ) -> None:
-        import subprocess
-
-        runner = CliRunner(env=sqlite_env)
-
         # Create a bug
-        runner.invoke(main, ["new", "bug", "--title", "Test bug"
-        ])
-
-        # Save original subprocess.run
-        original_run = subprocess.run
+        env_service.create_issue(IssueType.BUG, "Test bug")
 
-        # Mock editor to return empty content (removes the item)
+        # Mock editor to return empty content (removes the item). groom only
+        # shells out to $EDITOR, so no call ever needs to reach a real process.
         def mock_editor(cmd, *args, **kwargs):
-            # Only mock editor calls (those with .md file), let taskwarrior through
-            if len(cmd) > 1 and isinstance(cmd[1], str) and cmd[1].endswith('.md'):
-                # Write empty content to the file being edited
-                temp_file = cmd[1]
-                with open(temp_file, 'w') as f:
-                    f.write("")  # Empty content means item is removed
-                return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
-            else:
-                # Pass through to real subprocess.run for taskwarrior commands
-                return original_run(cmd, *args, **kwargs)
+            assert cmd[1].endswith(".md"), f"unexpected subprocess call: {cmd}"
+            # Write empty content to the file being edited
+            with open(cmd[1], "w") as f:
+                f.write("")  # Empty content means item is removed
+            return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
 
         monkeypatch.setattr("tw.cli.subprocess.run", mock_editor)
 
-        result = runner.invoke(main, ["groom"
+        result = cli_runner.invoke(main, ["groom"
         ])
 
         # Check the groom command succeeded
         assert result.exit_code == 0, f"groom failed: {result.output}"
 
         # The bug should be resolved
-        view_result = runner.invoke(main, [
+        view_result = cli_runner.invoke(main, [
             "--json",
             "view", "TEST-1"
         ])
         assert view_result.exit_code == 0, f"view failed: {view_result.output}"
-        data = json.loads(view_result.output.strip())
+        data = load_json(view_result)
         assert data["tw_status"] == "done"
 
 
 class TestWatchCommand:
-    def test_watch_tree_command_validates_subcommand(self, sqlite_env: dict[str, str]) -> None:
-        """Test that watch command only accepts 'tree' subcommand."""
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(main, ["watch", "invalid"])
-        assert result.exit_code == 1
-        assert "only 'tree' subcommand is supported" in result.output
-
-    def test_watch_tree_command_validates_interval(self, sqlite_env: dict[str, str]) -> None:
-        """Test that watch command validates positive interval."""
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(main, ["watch", "tree", "-n", "0"])
-        assert result.exit_code == 1
-        assert "interval must be positive" in result.output
-
-    def test_watch_tree_command_validates_negative_interval(
-        self, sqlite_env: dict[str, str]
+    """Argument checks live in click parameter types; only check tw wires them up."""
+
+    @pytest.mark.parametrize(
+        ("args", "param_name"),
+        [
+            (["invalid"], "subcommand"),
+            (["tree", "-n", "0"], "interval"),
+            (["tree", "-n", "-5"], "interval"),
+        ],
+    )
+    def test_watch_rejects_invalid_argument(
+        self, cli_runner: CliRunner, args: list[str], param_name: str
     ) -> None:
-        """Test that watch command rejects negative interval."""
-        runner = CliRunner(env=sqlite_env)
-        result = runner.invoke(main, ["watch", "tree", "-n", "-5"])
-        assert result.exit_code == 1
-        assert "interval must be positive" in result.output
+        param = next(p for p in watch.params if p.name == param_name)
+        result = cli_runner.invoke(main, ["watch", *args])
+
+        assert result.exit_code == 2
+        assert param.get_error_hint(click.Context(watch)) in result.stderr
 
 
 class TestClaudeCommand:
@@ -1346,11 +1135,9 @@ class TestClaudeCommand:
         assert "Launch Claude with an issue brief" in result.output
 
     def test_claude_with_issue_id(
-        self, sqlite_env: dict[str, str], monkeypatch
+        self, sqlite_env: dict[str, str], env_service: IssueService, monkeypatch
     ) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        runner.invoke(main, ["new", "task", "--title", "Test task"])
+        env_service.create_issue(IssueType.TASK, "Test task")
 
         captured_args: list[list[str]] = []
 
@@ -1360,9 +1147,9 @@ class TestClaudeCommand:
 
         monkeypatch.setattr("tw.cli.subprocess.run", mock_run)
 
-        result = runner.invoke(main, ["claude", "TEST-1", "--sonnet"])
+        exit_code = _call_main(monkeypatch, sqlite_env, "claude", "TEST-1", "--sonnet")
 
-        assert result.exit_code == 0
+        assert exit_code == 0
         assert len(captured_args) == 1
         assert captured_args[0][0] == "claude"
         assert captured_args[0][1] == "--dangerously-skip-permissions"
@@ -1370,34 +1157,28 @@ class TestClaudeCommand:
         assert captured_args[0][3] == "sonnet"
         assert "TEST-1" in captured_args[0][4]
 
-    def test_claude_nonexistent_issue(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        result = runner.invoke(main, ["claude", "TEST-999"])
+    def test_claude_nonexistent_issue(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(main, ["claude", "TEST-999"])
 
         assert result.exit_code == 1
         assert "error" in result.output.lower()
 
     def test_claude_no_actionable_issues(
-        self, sqlite_env: dict[str, str]
+        self, cli_runner: CliRunner, env_service: IssueService
     ) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        runner.invoke(main, ["new", "task", "--title", "Test task"])
-        runner.invoke(main, ["start", "TEST-1"])
-        runner.invoke(main, ["done", "TEST-1"])
+        env_service.create_issue(IssueType.TASK, "Test task")
+        env_service.start_issue("TEST-1")
+        env_service.done_issue("TEST-1")
 
-        result = runner.invoke(main, ["claude"], input="\n")
+        result = cli_runner.invoke(main, ["claude"], input="\n")
 
         assert result.exit_code == 1
         assert "No actionable issues" in result.output
 
     def test_claude_with_opus_flag(
-        self, sqlite_env: dict[str, str], monkeypatch
+        self, sqlite_env: dict[str, str], env_service: IssueService, monkeypatch
     ) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        runner.invoke(main, ["new", "task", "--title", "Test task"])
+        env_service.create_issue(IssueType.TASK, "Test task")
 
         captured_args: list[list[str]] = []
 
@@ -1407,17 +1188,15 @@ class TestClaudeCommand:
 
         monkeypatch.setattr("tw.cli.subprocess.run", mock_run)
 
-        result = runner.invoke(main, ["claude", "TEST-1", "--opus"])
+        exit_code = _call_main(monkeypatch, sqlite_env, "claude", "TEST-1", "--opus")
 
-        assert result.exit_code == 0
+        assert exit_code == 0
         assert captured_args[0][3] == "opus"
 
     def test_claude_with_haiku_flag(
-        self, sqlite_env: dict[str, str], monkeypatch
+        self, sqlite_env: dict[str, str], env_service: IssueService, monkeypatch
     ) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        runner.invoke(main, ["new", "task", "--title", "Test task"])
+        env_service.create_issue(IssueType.TASK, "Test task")
 
         captured_args: list[list[str]] = []
 
@@ -1427,19 +1206,17 @@ class TestClaudeCommand:
 
         monkeypatch.setattr("tw.cli.subprocess.run", mock_run)
 
-        result = runner.invoke(main, ["claude", "TEST-1", "--haiku"])
+        exit_code = _call_main(monkeypatch, sqlite_env, "claude", "TEST-1", "--haiku")
 
-        assert result.exit_code == 0
+        assert exit_code == 0
         assert captured_args[0][3] == "haiku"
 
     def test_claude_multiple_model_flags_error(
-        self, sqlite_env: dict[str, str]
+        self, cli_runner: CliRunner, env_service: IssueService
     ) -> None:
-        runner = CliRunner(env=sqlite_env)
-
-        runner.invoke(main, ["new", "task", "--title", "Test task"])
+        env_service.create_issue(IssueType.TASK, "Test task")
 
-        result = runner.invoke(main, ["claude", "TEST-1", "--opus", "--sonnet"])
+        result = cli_runner.invoke(main, ["claude", "TEST-1", "--opus", "--sonnet"])
 
         assert result.exit_code == 1
         assert "only one model flag" in result.output
@@ -4,7 +4,13 @@ from pathlib import Path
 
 import pytest
 
-from tw.config import DEFAULT_DB_PATH, ConfigError, get_db_path, get_prefix
+from tw.config import (
+    DEFAULT_DB_PATH,
+    ConfigError,
+    get_db_path,
+    get_prefix,
+    get_sqlite_synchronous,
+)
 
 
 class TestGetDbPath:
@@ -45,3 +51,18 @@ class TestGetPrefix:
         monkeypatch.delenv("TW_PROJECT_PREFIX", raising=False)
         with pytest.raises(ConfigError):
             get_prefix()
+
+
+class TestGetSqliteSynchronous:
+    def test_returns_none_when_not_set(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("TW_SQLITE_SYNCHRONOUS", raising=False)
+        assert get_sqlite_synchronous() is None
+
+    def test_normalizes_case(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TW_SQLITE_SYNCHRONOUS", "off")
+        assert get_sqlite_synchronous() == "OFF"
+
+    def test_rejects_unknown_mode(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TW_SQLITE_SYNCHRONOUS", "OFF; DROP TABLE issues")
+        with pytest.raises(ConfigError):
+            get_sqlite_synchronous()
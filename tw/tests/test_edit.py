@@ -1,153 +1,124 @@
 """Tests for the edit command."""
 
-import json
-
 from click.testing import CliRunner
 
+from tests.helpers import load_json
 from tw.cli import main
+from tw.models import IssueType
+from tw.service import IssueDraft, IssueService
 
 
 class TestEditCommand:
-    def test_edit_with_title_only(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main,
-            ["new", "epic", "--title", "Old Title"],
-        )
+    def test_edit_with_title_only(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        env_service.create_issue(IssueType.EPIC, "Old Title")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["edit", "TEST-1", "--title", "New Title"],
         )
         assert result.exit_code == 0
         assert "TEST-1" in result.output
 
-        view_result = runner.invoke(
-            main,
-            ["view", "TEST-1"],
-        )
-        assert "New Title" in view_result.output
-        assert "Old Title" not in view_result.output
+        assert env_service.get_issue("TEST-1").title == "New Title"
 
-    def test_edit_with_body_only(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main, ["new", "epic", "--title", "Title", "--body", "Old body"],
-        )
+    def test_edit_with_body_only(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        env_service.create_issue(IssueType.EPIC, "Title", body="Old body")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main, ["edit", "TEST-1", "--body", "New body content"],
         )
         assert result.exit_code == 0
 
-        view_result = runner.invoke(
-            main, ["view", "TEST-1"],
-        )
-        assert "New body content" in view_result.output
+        issue = env_service.get_issue("TEST-1")
+        assert issue.title == "Title"
+        assert issue.body == "New body content"
 
-    def test_edit_with_title_and_body(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main, ["new", "epic", "--title", "Old Title", "--body", "Old body"],
-        )
+    def test_edit_with_title_and_body(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        env_service.create_issue(IssueType.EPIC, "Old Title", body="Old body")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main, ["edit", "TEST-1", "--title", "New Title", "--body", "New body"],
         )
         assert result.exit_code == 0
 
-        view_result = runner.invoke(
-            main, ["view", "TEST-1"],
-        )
-        assert "New Title" in view_result.output
-        assert "New body" in view_result.output
+        issue = env_service.get_issue("TEST-1")
+        assert issue.title == "New Title"
+        assert issue.body == "New body"
 
-    def test_edit_with_stdin_body(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main, ["new", "epic", "--title", "Title"],
-        )
+    def test_edit_with_stdin_body(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        env_service.create_issue(IssueType.EPIC, "Title")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main, ["edit", "TEST-1", "--body", "-"],
             input="Body from stdin",
         )
         assert result.exit_code == 0
 
-        view_result = runner.invoke(
-            main, ["view", "TEST-1"],
-        )
-        assert "Body from stdin" in view_result.output
+        assert env_service.get_issue("TEST-1").body == "Body from stdin"
 
-    def test_edit_extracts_references(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main, ["new", "epic", "--title", "Epic 1"],
-        )
-        runner.invoke(
-            main, ["new", "epic", "--title", "Epic 2"],
+    def test_edit_extracts_references(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        env_service.create_issues(
+            [IssueDraft(IssueType.EPIC, "Epic 1"), IssueDraft(IssueType.EPIC, "Epic 2")]
         )
 
-        result = runner.invoke(
-            main, ["edit", "TEST-1", "--body", "This references TEST-2"],
+        result = cli_runner.invoke(
+            main, ["--json", "edit", "TEST-1", "--body", "This references TEST-2"],
         )
         assert result.exit_code == 0
 
-        view_result = runner.invoke(
-            main,
-            ["--json", "view", "TEST-1"],
-        )
-        output = json.loads(view_result.output.strip())
-        assert "TEST-2" in output["tw_refs"]
+        assert load_json(result)["tw_refs"] == ["TEST-2"]
 
-    def test_edit_json_output(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main, ["new", "epic", "--title", "Title"],
-        )
+    def test_edit_json_output(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        env_service.create_issue(IssueType.EPIC, "Title")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main,
             ["--json",
              "edit", "TEST-1", "--title", "New Title"],
         )
         assert result.exit_code == 0
-        output = json.loads(result.output.strip())
+        output = load_json(result)
         assert output["tw_id"] == "TEST-1"
+        assert output["title"] == "New Title"
 
-    def test_edit_nonexistent_issue(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
+        view_result = cli_runner.invoke(main, ["--json", "view", "TEST-1"])
+        assert output == load_json(view_result)
 
-        result = runner.invoke(
+    def test_edit_nonexistent_issue(self, cli_runner: CliRunner) -> None:
+        result = cli_runner.invoke(
             main, ["edit", "TEST-999", "--title", "Title"],
         )
         assert result.exit_code != 0
 
-    def test_edit_empty_body_clears_content(self, sqlite_env: dict[str, str]) -> None:
-        runner = CliRunner(env=sqlite_env)
-        runner.invoke(
-            main, ["new", "epic", "--title", "Title", "--body", "Original body"],
-        )
+    def test_edit_empty_body_clears_content(
+        self, cli_runner: CliRunner, env_service: IssueService
+    ) -> None:
+        env_service.create_issue(IssueType.EPIC, "Title", body="Original body")
 
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main, ["edit", "TEST-1", "--body", ""],
         )
         assert result.exit_code == 0
 
-        view_result = runner.invoke(
-            main,
-            ["--json", "view", "TEST-1"],
-        )
-        output = json.loads(view_result.output.strip())
-        assert output["tw_body"] is None or output["tw_body"] == ""
+        assert not env_service.get_issue("TEST-1").body
 
     def test_edit_no_id_no_issues_shows_error(
-        self, sqlite_env: dict[str, str]
+        self, cli_runner: CliRunner
     ) -> None:
         """When no ID provided and no open issues exist, show error."""
-        runner = CliRunner(env=sqlite_env)
-
-        result = runner.invoke(
+        result = cli_runner.invoke(
             main, ["edit"],
         )
         assert result.exit_code != 0
@@ -1,6 +1,9 @@
 """Tests for ID utilities."""
 
+import pytest
+
 from tw.ids import (
+    IdIndex,
     generate_next_epic_id,
     generate_next_story_id,
     generate_next_task_id,
@@ -37,7 +40,6 @@ class TestParseId:
         assert result.task_suffix == "aa"
 
     def test_invalid_id(self) -> None:
-        import pytest
         with pytest.raises(ValueError, match="Invalid tw_id format"):
             parse_id("invalid")
 
@@ -79,6 +81,10 @@ class TestParseIdSortKey:
         assert parse_id_sort_key("PROJ-1-1b") < parse_id_sort_key("PROJ-1-1aa")
         assert parse_id_sort_key("PROJ-1-2") < parse_id_sort_key("PROJ-1-10")
 
+    def test_invalid_id(self) -> None:
+        with pytest.raises(ValueError, match="Invalid tw_id format"):
+            parse_id_sort_key("proj-1")
+
 
 class TestGenerateNextEpicId:
     def test_first_epic(self) -> None:
@@ -134,6 +140,10 @@ class TestGenerateNextTaskId:
         existing.extend([f"PROJ-1-1a{chr(ord('a') + i)}" for i in range(26)])
         assert generate_next_task_id("PROJ-1-1", existing) == "PROJ-1-1ba"
 
+    def test_carries_into_earlier_letters(self) -> None:
+        assert generate_next_task_id("PROJ-1-1", ["PROJ-1-1azz"]) == "PROJ-1-1baa"
+        assert generate_next_task_id("PROJ-1-1", ["PROJ-1-1zz"]) == "PROJ-1-1aaa"
+
     def test_orphan_task(self) -> None:
         existing = ["PROJ-1", "PROJ-2"]
         assert generate_next_task_id(None, existing, prefix="PROJ") == "PROJ-3"
@@ -145,3 +155,26 @@ class TestGenerateNextTaskId:
     def test_task_under_orphan_story_sequential(self) -> None:
         existing = ["PROJ-1", "PROJ-2", "PROJ-2-1", "PROJ-2-2"]
         assert generate_next_task_id("PROJ-2", existing) == "PROJ-2-3"
+
+
+class TestIdIndex:
+    def test_allocates_from_existing(self) -> None:
+        existing = ["PROJ-1", "PROJ-1-1", "PROJ-1-1a", "PROJ-1-1z", "PROJ-1-2", "PROJ-3", "OTHER-9"]
+        index = IdIndex(existing)
+        assert index.next_epic_id("PROJ") == "PROJ-4"
+        assert index.next_epic_id("OTHER") == "OTHER-10"
+        assert index.next_story_id("PROJ-1") == "PROJ-1-3"
+        assert index.next_task_id("PROJ-1") == "PROJ-1-3"
+        assert index.next_task_id("PROJ-1-1") == "PROJ-1-1aa"
+        assert index.next_task_id("PROJ-1-2") == "PROJ-1-2a"
+
+    def test_record_advances_allocation(self) -> None:
+        index = IdIndex(["PROJ-1", "PROJ-1-1"])
+        index.record("PROJ-1-1a")
+        index.record("PROJ-2")
+        assert index.next_task_id("PROJ-1-1") == "PROJ-1-1b"
+        assert index.next_epic_id("PROJ") == "PROJ-3"
+
+    def test_ignores_invalid_ids(self) -> None:
+        index = IdIndex(["invalid", "PROJ-1"])
+        assert index.next_epic_id("PROJ") == "PROJ-2"
@@ -79,7 +79,6 @@ class TestAnnotation:
 
 class TestIssue:
     def test_create_minimal(self) -> None:
-        from datetime import datetime
         now = datetime.now(UTC)
         issue = Issue(id="PROJ-1",
             type=IssueType.EPIC,
@@ -97,7 +96,6 @@ class TestIssue:
         assert issue.annotations == []
 
     def test_create_full(self) -> None:
-        from datetime import datetime
         now = datetime.now(UTC)
         issue = Issue(id="PROJ-1-1a",
             type=IssueType.TASK,
@@ -114,7 +112,6 @@ class TestIssue:
         assert issue.refs == ["PROJ-2", "PROJ-3"]
 
     def test_get_repeatable_body(self) -> None:
-        from datetime import datetime
         now = datetime.now(UTC)
         issue = Issue(id="PROJ-1",
             type=IssueType.EPIC,
@@ -127,7 +124,6 @@ class TestIssue:
         assert issue.get_repeatable_body() == "This is repeatable."
 
     def test_get_repeatable_body_no_separator(self) -> None:
-        from datetime import datetime
         now = datetime.now(UTC)
         issue = Issue(id="PROJ-1",
             type=IssueType.EPIC,
@@ -140,7 +136,6 @@ class TestIssue:
         assert issue.get_repeatable_body() == "All of this is repeatable."
 
     def test_get_repeatable_body_none(self) -> None:
-        from datetime import datetime
         now = datetime.now(UTC)
         issue = Issue(id="PROJ-1",
             type=IssueType.EPIC,
@@ -152,7 +147,6 @@ class TestIssue:
         assert issue.get_repeatable_body() == ""
 
     def test_get_full_body(self) -> None:
-        from datetime import datetime
         now = datetime.now(UTC)
         issue = Issue(id="PROJ-1",
             type=IssueType.EPIC,
@@ -1,33 +1,59 @@
 """Tests for references extraction."""
 
-from tw.refs import extract_refs
+import pytest
 
+from tw.refs import _ref_pattern, extract_refs, extract_refs_many
 
-class TestExtractRefs:
-    def test_no_refs(self) -> None:
-        text = "This is some text without any references."
-        assert extract_refs(text, "PROJ") == []
-
-    def test_single_ref(self) -> None:
-        text = "See PROJ-1 for details."
-        assert extract_refs(text, "PROJ") == ["PROJ-1"]
-
-    def test_multiple_refs(self) -> None:
-        text = "Related to PROJ-1, PROJ-2-1, and PROJ-3-1a."
-        assert extract_refs(text, "PROJ") == ["PROJ-1", "PROJ-2-1", "PROJ-3-1a"]
-
-    def test_sorted_output(self) -> None:
-        text = "See PROJ-10, PROJ-2, PROJ-1."
-        assert extract_refs(text, "PROJ") == ["PROJ-1", "PROJ-2", "PROJ-10"]
 
-    def test_deduplicated(self) -> None:
-        text = "PROJ-1 is related to PROJ-1."
-        assert extract_refs(text, "PROJ") == ["PROJ-1"]
-
-    def test_different_prefix(self) -> None:
-        text = "See AUTH-1 and AUTH-2-1."
-        assert extract_refs(text, "AUTH") == ["AUTH-1", "AUTH-2-1"]
-
-    def test_ignores_other_prefixes(self) -> None:
-        text = "See PROJ-1 and OTHER-2."
-        assert extract_refs(text, "PROJ") == ["PROJ-1"]
+class TestExtractRefs:
+    @pytest.mark.parametrize(
+        ("text", "prefix", "expected"),
+        [
+            pytest.param(
+                "This is some text without any references.", "PROJ", [], id="no_refs"
+            ),
+            pytest.param("See PROJ-1 for details.", "PROJ", ["PROJ-1"], id="single_ref"),
+            pytest.param(
+                "Related to PROJ-1, PROJ-2-1, and PROJ-3-1a.",
+                "PROJ",
+                ["PROJ-1", "PROJ-2-1", "PROJ-3-1a"],
+                id="multiple_refs",
+            ),
+            pytest.param(
+                "See PROJ-10, PROJ-2, PROJ-1.",
+                "PROJ",
+                ["PROJ-1", "PROJ-2", "PROJ-10"],
+                id="sorted_output",
+            ),
+            pytest.param(
+                "PROJ-1 is related to PROJ-1.", "PROJ", ["PROJ-1"], id="deduplicated"
+            ),
+            pytest.param(
+                "See AUTH-1 and AUTH-2-1.",
+                "AUTH",
+                ["AUTH-1", "AUTH-2-1"],
+                id="different_prefix",
+            ),
+            pytest.param(
+                "See PROJ-1 and OTHER-2.", "PROJ", ["PROJ-1"], id="ignores_other_prefixes"
+            ),
+            pytest.param(
+                "The PROJ- prefix alone, or PROJ-x, is not a reference.",
+                "PROJ",
+                [],
+                id="prefix_without_number",
+            ),
+        ],
+    )
+    def test_extract_refs(self, text: str, prefix: str, expected: list[str]) -> None:
+        assert extract_refs(text, prefix) == expected
+
+    def test_pattern_compiled_once_per_prefix(self) -> None:
+        assert _ref_pattern("PROJ") is _ref_pattern("PROJ")
+        assert _ref_pattern("PROJ") is not _ref_pattern("AUTH")
+
+
+class TestExtractRefsMany:
+    def test_merges_and_deduplicates_across_texts(self) -> None:
+        texts = ["See PROJ-10 and PROJ-2.", "No refs here.", "PROJ-2 blocks PROJ-1-1a."]
+        assert extract_refs_many(texts, "PROJ") == ["PROJ-1-1a", "PROJ-2", "PROJ-10"]
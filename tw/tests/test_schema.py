@@ -3,7 +3,7 @@
 import sqlite3
 from pathlib import Path
 
-from tw.schema import init_db
+from tw.schema import SCHEMA_VERSION, init_db
 
 
 class TestInitDb:
@@ -187,3 +187,55 @@ class TestInitDb:
 
         assert "issues" in tables
         assert "annotations" in tables
+
+    def test_stamps_schema_version(self, temp_dir: Path) -> None:
+        db_path = temp_dir / "test.db"
+        init_db(db_path)
+
+        conn = sqlite3.connect(db_path)
+        (user_version,) = conn.execute("PRAGMA user_version").fetchone()
+        conn.close()
+
+        assert user_version == SCHEMA_VERSION
+
+    def test_skips_ddl_for_current_database(self, temp_dir: Path) -> None:
+        db_path = temp_dir / "test.db"
+        init_db(db_path)
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP INDEX idx_annotations_type")
+        conn.commit()
+        conn.close()
+
+        init_db(db_path)
+
+        conn = sqlite3.connect(db_path)
+        cursor = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND name='idx_annotations_type'"
+        )
+        result = cursor.fetchone()
+        conn.close()
+
+        assert result is None
+
+    def test_upgrades_unversioned_database(self, temp_dir: Path) -> None:
+        db_path = temp_dir / "test.db"
+        init_db(db_path)
+
+        # Databases created before versioning have user_version 0
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE annotations")
+        conn.execute("PRAGMA user_version = 0")
+        conn.commit()
+        conn.close()
+
+        init_db(db_path)
+
+        conn = sqlite3.connect(db_path)
+        (user_version,) = conn.execute("PRAGMA user_version").fetchone()
+        cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        tables = [row[0] for row in cursor.fetchall()]
+        conn.close()
+
+        assert user_version == SCHEMA_VERSION
+        assert "annotations" in tables
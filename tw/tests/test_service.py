@@ -3,7 +3,7 @@
 import pytest
 
 from tw.models import AnnotationType, IssueStatus, IssueType
-from tw.service import IssueService
+from tw.service import IssueDraft, IssueService
 
 
 class TestIssueService:
@@ -98,6 +98,40 @@ class TestIssueService:
         assert tw_id == "TEST-1-1c"
 
 
+class TestCreateIssues:
+    def test_create_batch_with_parent_index(self, sqlite_service: IssueService) -> None:
+        service = sqlite_service
+        service.create_issue(IssueType.EPIC, "Existing")
+
+        tw_ids = service.create_issues(
+            [
+                IssueDraft(IssueType.EPIC, "Epic"),
+                IssueDraft(IssueType.STORY, "Story", parent_index=0),
+                IssueDraft(IssueType.TASK, "Task a", parent_index=1),
+                IssueDraft(IssueType.TASK, "Task b", parent_index=1, body="See TEST-1"),
+                IssueDraft(IssueType.STORY, "Other", parent_id="TEST-1"),
+            ]
+        )
+
+        assert tw_ids == ["TEST-2", "TEST-2-1", "TEST-2-1a", "TEST-2-1b", "TEST-1-1"]
+        assert service.get_issue("TEST-2-1a").parent == "TEST-2-1"
+        assert service.get_issue("TEST-2-1b").refs == ["TEST-1"]
+
+    def test_invalid_batch_writes_nothing(self, sqlite_service: IssueService) -> None:
+        service = sqlite_service
+
+        with pytest.raises(ValueError, match="cannot have children"):
+            service.create_issues(
+                [
+                    IssueDraft(IssueType.EPIC, "Epic"),
+                    IssueDraft(IssueType.IDEA, "Idea"),
+                    IssueDraft(IssueType.TASK, "Task", parent_index=1),
+                ]
+            )
+
+        assert service.get_all_issues() == []
+
+
 class TestStatusTransitions:
     def test_start_from_new(self, sqlite_service: IssueService) -> None:
         service = sqlite_service
@@ -225,6 +259,17 @@ class TestUpdateIssue:
         assert issue.body is None
         assert issue.refs == []
 
+    def test_update_returns_saved_issue(self, sqlite_service: IssueService) -> None:
+        service = sqlite_service
+
+        service.create_issue(IssueType.EPIC, "Old Title")
+        service.create_issue(IssueType.EPIC, "Epic 2")
+        updated = service.update_issue("TEST-1", title="New Title", body="See TEST-2, TEST-9")
+
+        assert updated.title == "New Title"
+        assert updated.refs == ["TEST-2"]
+        assert updated == service.get_issue("TEST-1")
+
     def test_update_nonexistent_issue(self, sqlite_service: IssueService) -> None:
         service = sqlite_service
 
@@ -24,6 +24,18 @@ class TestSqliteBackendCreation:
         SqliteBackend(db_path)
         assert db_path.exists()
 
+    def test_applies_synchronous_mode_to_connections(self, temp_dir: Path) -> None:
+        """The configured synchronous pragma is set on each connection."""
+        backend = SqliteBackend(temp_dir / "test.db", synchronous="OFF")
+        with backend._connect() as conn:
+            (mode,) = conn.execute("PRAGMA synchronous").fetchone()
+        assert mode == 0
+
+    def test_rejects_unknown_synchronous_mode(self, temp_dir: Path) -> None:
+        """Only real synchronous modes are interpolated into the pragma."""
+        with pytest.raises(ValueError):
+            SqliteBackend(temp_dir / "test.db", synchronous="FAST")
+
 
 class TestGetAllIssues:
     """Test get_all_issues() method."""
@@ -96,6 +108,44 @@ class TestGetAllIssues:
         assert len(all_issues) == 2
         assert {i.id for i in all_issues} == {"TEST-1", "TEST-2"}
 
+    def test_attaches_annotations_and_refs_to_each_issue(self, temp_dir: Path) -> None:
+        """Annotations and refs are grouped onto the issue they belong to."""
+        db_path = temp_dir / "test.db"
+        backend = SqliteBackend(db_path)
+        now = datetime.now(UTC)
+
+        backend.save_issue(
+            Issue(
+                id="TEST-1",
+                type=IssueType.EPIC,
+                title="Epic 1",
+                status=IssueStatus.NEW,
+                created_at=now,
+                updated_at=now,
+                annotations=[
+                    Annotation(type=AnnotationType.COMMENT, timestamp=now, message="first"),
+                    Annotation(type=AnnotationType.COMMENT, timestamp=now, message="second"),
+                ],
+            )
+        )
+        backend.save_issue(
+            Issue(
+                id="TEST-2",
+                type=IssueType.EPIC,
+                title="Epic 2",
+                status=IssueStatus.NEW,
+                created_at=now,
+                updated_at=now,
+                refs=["TEST-1"],
+            )
+        )
+
+        issues = {i.id: i for i in backend.get_all_issues()}
+        assert [a.message for a in issues["TEST-1"].annotations] == ["first", "second"]
+        assert issues["TEST-1"].refs == []
+        assert issues["TEST-2"].annotations == []
+        assert issues["TEST-2"].refs == ["TEST-1"]
+
 
 class TestGetIssue:
     """Test get_issue() method."""
@@ -385,6 +435,57 @@ class TestSaveIssue:
         assert retrieved.title == "Updated Title"
 
 
+class TestInsertIssues:
+    """Test insert_issues() method."""
+
+    def test_inserts_annotations_and_same_batch_refs(self, temp_dir: Path) -> None:
+        """Annotations are stored and refs resolve to issues in the same batch."""
+        db_path = temp_dir / "test.db"
+        backend = SqliteBackend(db_path)
+        now = datetime.now(UTC).replace(microsecond=0)
+
+        backend.insert_issues(
+            [
+                Issue(
+                    id="TEST-1",
+                    type=IssueType.EPIC,
+                    title="Epic 1",
+                    status=IssueStatus.NEW,
+                    created_at=now,
+                    updated_at=now,
+                    refs=["TEST-2", "TEST-9"],
+                    annotations=[
+                        Annotation(type=AnnotationType.COMMENT, timestamp=now, message="first"),
+                        Annotation(type=AnnotationType.LESSON, timestamp=now, message="second"),
+                    ],
+                ),
+                Issue(
+                    id="TEST-2",
+                    type=IssueType.EPIC,
+                    title="Epic 2",
+                    status=IssueStatus.NEW,
+                    created_at=now,
+                    updated_at=now,
+                    refs=["TEST-1"],
+                ),
+            ]
+        )
+
+        issue = backend.get_issue("TEST-1")
+        assert issue is not None
+        assert issue.refs == ["TEST-2"]
+        assert [(a.type, a.message, a.timestamp) for a in issue.annotations or []] == [
+            (AnnotationType.COMMENT, "first", now),
+            (AnnotationType.LESSON, "second", now),
+        ]
+
+        issues = {i.id: i for i in backend.get_all_issues()}
+        assert issues["TEST-1"].refs == ["TEST-2"]
+        assert [a.message for a in issues["TEST-1"].annotations or []] == ["first", "second"]
+        assert issues["TEST-2"].refs == ["TEST-1"]
+        assert issues["TEST-2"].annotations == []
+
+
 class TestDeleteIssue:
     """Test delete_issue() method."""
 